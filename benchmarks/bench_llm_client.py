@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark: LLM client throttling, retries and connection reuse against a local fake endpoint
+
+Runs analyze_deals on a synthetic deal book against fake_llm.FakeLLMServer
+in several scenarios (no limits, a server-side rate limit with and without
+Retry-After, flaky 503s) and reports wall time, retries, 429s, batches that
+fell back to the rule engine, peak in-flight requests and connections.
+
+Usage: python benchmarks/bench_llm_client.py [--rows 10000] [--concurrency 4]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from core.data_parser import DataParser
+from core.llm_interface import LLMInterface
+from fake_llm import FakeLLMServer
+from synthetic import write_deal_book
+from utils.profiling import Profiler
+
+# name, fake server options; client-side limits are off so the server's own limit is what gets hit
+SCENARIOS = [
+    ('unlimited', {}),
+    ('rate_limited', {'limit': 8, 'window': 2}),
+    ('rate_limited_no_header', {'limit': 8, 'window': 2, 'retry_after': False}),
+    ('flaky_503', {'error_rate': 0.15}),
+]
+
+
+def run_scenario(dataset, server_options, concurrency, latency):
+    with FakeLLMServer(latency=latency, **server_options) as server:
+        llm = LLMInterface('test', server.base_url, max_concurrency=concurrency, use_cache=False,
+                           requests_per_minute=0, tokens_per_minute=0)
+        # Keep the retry schedule short enough for a benchmark
+        llm.max_retries = 8
+        profiler = Profiler(trace_memory=False)
+        start = time.perf_counter()
+        result = llm.analyze_deals(dataset, profiler)
+        wall = time.perf_counter() - start
+        llm.close()
+        http = next(record for record in profiler.to_dict() if record['stage'] == 'http')
+        return {
+            'wall_s': wall,
+            'batches': http['rows'],
+            'retries': http['retries'],
+            'rate_limited': http['rate_limited'],
+            'failed_batches': len(result.get('errors', [])),
+            'max_in_flight': server.stats['max_in_flight'],
+            'connections': http['connections'],
+        }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Exercise the LLM client against a local fake endpoint.")
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.1, help="fake completion latency in seconds")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='watchdog_bench_') as work_dir:
+        path = write_deal_book(os.path.join(work_dir, 'deals.csv'), args.rows)
+        dataset = DataParser(use_cache=False).parse_file(path)
+
+    print(f"{'scenario':>24} {'wall':>8} {'batches':>8} {'retries':>8} {'429s':>6} "
+          f"{'failed':>7} {'in-flight':>10} {'conns':>6}")
+    for name, server_options in SCENARIOS:
+        r = run_scenario(dataset, server_options, args.concurrency, args.latency)
+        print(f"{name:>24} {r['wall_s']:7.2f}s {r['batches']:>8} {r['retries']:>8} {r['rate_limited']:>6} "
+              f"{r['failed_batches']:>7} {r['max_in_flight']:>10} {r['connections']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: vectorized rule engine vs. the original per-row loop
+
+Usage: python benchmarks/bench_rules.py [rows ...]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import HIGH_DISCOUNT_THRESHOLD, OPPORTUNITY_COST_FACTOR
+from core.deal_dataset import DealDataset
+from core.rules import evaluate_rules
+from utils.helpers import is_date_past
+
+
+def make_deals(rows: int, seed: int = 7) -> DealDataset:
+    """Build a synthetic deal book with a mix of discounts and close dates"""
+    rng = np.random.default_rng(seed)
+    close_dates = pd.Timestamp('2022-01-01') + pd.to_timedelta(rng.integers(0, 3650, rows), unit='D')
+    close_dates = close_dates.strftime('%Y-%m-%d').to_numpy(dtype=object)
+    close_dates[rng.random(rows) < 0.1] = ''
+    return DealDataset(pd.DataFrame({
+        'deal_id': [f"DEAL_{i:04d}" for i in range(rows)],
+        'customer_name': rng.choice(['Acme', 'Globex', 'Initech', 'Umbrella'], rows),
+        'deal_size': rng.integers(1000, 500000, rows).astype(float),
+        'discount_percent': rng.choice([0, 5, 10, 15, 25, 30, 40], rows).astype(float),
+        'close_date': close_dates,
+        'renewal': '',
+        'deal_status': 'Open',
+    }))
+
+
+def loop_rules(records):
+    """Reference implementation: the original row-at-a-time loop"""
+    flagged_deals = []
+    total_leakage = 0
+
+    for deal in records:
+        deal_id = deal.get('deal_id', 'Unknown')
+        deal_size = float(deal.get('deal_size', 0))
+        discount = float(deal.get('discount_percent', 0))
+
+        if discount > HIGH_DISCOUNT_THRESHOLD:
+            impact = deal_size * (discount - HIGH_DISCOUNT_THRESHOLD) / 100
+            flagged_deals.append({
+                'deal_id': deal_id,
+                'risk_type': 'unauthorized_discount',
+                'impact': impact,
+                'suggestion': f'Review {discount}% discount approval for deal {deal_id}'
+            })
+            total_leakage += impact
+
+        close_date = deal.get('close_date', '')
+        if close_date and is_date_past(close_date):
+            impact = deal_size * OPPORTUNITY_COST_FACTOR
+            flagged_deals.append({
+                'deal_id': deal_id,
+                'risk_type': 'phantom_pipeline',
+                'impact': impact,
+                'suggestion': f'Remove expired deal {deal_id} from pipeline'
+            })
+            total_leakage += impact
+
+    return flagged_deals, total_leakage
+
+
+def main(argv):
+    sizes = [int(arg) for arg in argv] or [1000, 10000, 50000]
+
+    print(f"{'rows':>10} {'loop (s)':>10} {'vector (s)':>11} {'speedup':>9}")
+    for rows in sizes:
+        dataset = make_deals(rows)
+        records = dataset.to_records()
+
+        start = time.perf_counter()
+        expected = loop_rules(records)
+        loop_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        actual = evaluate_rules(dataset)
+        vector_time = time.perf_counter() - start
+
+        if actual != expected:
+            raise SystemExit(f"Mismatch between loop and vectorized results at {rows} rows")
+
+        print(f"{rows:>10} {loop_time:>10.3f} {vector_time:>11.3f} {loop_time / vector_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
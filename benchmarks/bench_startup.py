@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold-start time to the first window
+
+Each run starts a fresh interpreter, goes through main.py's startup path and
+records how long it takes until the Tk window is mapped, plus which heavy
+modules were already imported at that point. Without a display the window
+step is skipped and only the import cost of the startup path is measured.
+
+Usage: python benchmarks/bench_startup.py [runs]
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ['pandas', 'numpy', 'requests', 'PyPDF2', 'pdfplumber', 'openpyxl']
+
+PROBE = r'''
+import time
+start = time.perf_counter()
+import json, sys
+sys.path.insert(0, {root!r})
+
+import main
+result = {{'missing': main.check_dependencies()}}
+try:
+    root, app = main.create_app()
+    root.update()
+    result['window'] = root.winfo_ismapped()
+except Exception as e:
+    # No display: measure the imports the window would wait for
+    import gui.main_window
+    result['window'] = None
+    result['error'] = str(e).splitlines()[0]
+result['elapsed'] = time.perf_counter() - start
+result['loaded'] = [name for name in {heavy!r} if name in sys.modules]
+print(json.dumps(result))
+'''
+
+# What the window used to wait for: every module the old startup imported eagerly
+EAGER_PROBE = r'''
+import time
+start = time.perf_counter()
+import json, sys
+sys.path.insert(0, {root!r})
+import core.data_parser, core.llm_interface, gui.main_window
+print(json.dumps({{'elapsed': time.perf_counter() - start}}))
+'''
+
+
+def run_probe(source: str) -> dict:
+    """Run a probe in a fresh interpreter; adds wall time including interpreter startup"""
+    started = time.perf_counter()
+    output = subprocess.run([sys.executable, '-c', source], capture_output=True, text=True, check=True).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+    result['wall'] = time.perf_counter() - started
+    return result
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    probe = PROBE.format(root=ROOT, heavy=HEAVY_MODULES)
+    eager_probe = EAGER_PROBE.format(root=ROOT)
+
+    # One untimed run warms the OS file cache and bytecode caches
+    run_probe(probe)
+    results = [run_probe(probe) for _ in range(runs)]
+    eager = [run_probe(eager_probe) for _ in range(runs)]
+
+    first = results[0]
+    if first['window'] is None:
+        print(f"No display ({first.get('error', 'unknown error')}); timing the startup imports only")
+        label = 'startup imports'
+    else:
+        label = 'time to first window'
+
+    print(f"{label:>22}: {statistics.median(r['elapsed'] for r in results) * 1000:8.1f} ms in-process, "
+          f"{statistics.median(r['wall'] for r in results) * 1000:8.1f} ms wall (median of {runs})")
+    print(f"{'eager heavy imports':>22}: {statistics.median(r['elapsed'] for r in eager) * 1000:8.1f} ms in-process")
+    print(f"{'loaded before window':>22}: {', '.join(first['loaded']) or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite: parsing, analysis, prompt building, rendering and export
+
+Generates deterministic synthetic deal books (see synthetic.py), times each
+stage of the pipeline and writes the results as JSON so runs from different
+commits can be compared with --baseline.
+
+Usage:
+    python benchmarks/bench_suite.py --rows 10000 100000 --output results.json
+    python benchmarks/bench_suite.py --rows 10000 --baseline results.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pandas as pd
+
+from core.data_parser import DataParser
+from core.deal_dataset import DealDataset, IncrementalDealDataset
+from core.exporters import export_csv, export_excel, export_json
+from core.llm_interface import LLMInterface, PROMPT_FORMATS
+from synthetic import write_deal_book
+
+PARSE_FORMATS = ['csv', 'txt', 'csv.gz', 'xlsx', 'pdf']
+# Tables long enough that reportlab splits them, so continuations arrive without a header row
+PDF_SPLIT_ROWS_PER_PAGE = 60
+
+# Stages that get slow or memory-hungry far beyond realistic use run on a
+# prefix of the book; the row count actually used is recorded with each result
+STAGE_MAX_ROWS = {
+    'parse:xlsx': 200000,
+    'parse:pdf': 2000,
+    'parse:pdf_split_tables': 2000,
+    'build_analysis_prompt': 1000000,
+    'update_deals_tree': 100000,
+    'export:xlsx': 200000,
+}
+REGRESSION_THRESHOLD = 1.10
+
+
+def time_call(func, repeat: int):
+    """Run ``func`` ``repeat`` times; returns (per-run seconds, last result)"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return timings, result
+
+
+def make_tree_app():
+    """Build a hidden GUI window for timing the deals tree, or None without a display"""
+    try:
+        import tkinter as tk
+        from gui.main_window import RevenueWatchdogApp
+        root = tk.Tk()
+        root.withdraw()
+        return RevenueWatchdogApp(root)
+    except Exception:
+        return None
+
+
+def run_suite(sizes, formats, repeat, work_dir):
+    results = []
+
+    def record(stage, rows, timings, requested_rows, **extra):
+        entry = {
+            'stage': stage,
+            'rows': rows,
+            'requested_rows': requested_rows,
+            'best': min(timings),
+            'median': statistics.median(timings),
+            'runs': timings,
+        }
+        entry.update(extra)
+        results.append(entry)
+        print(f"{stage:>32} {rows:>10} rows  best {entry['best']:9.4f}s  median {entry['median']:9.4f}s")
+        if entry.get('parsed_rows', rows) != rows:
+            print(f"{'':>32} only {entry['parsed_rows']} of {rows} deals were parsed")
+        if entry.get('live_rows', entry.get('expected_rows')) != entry.get('expected_rows'):
+            print(f"{'':>32} {entry['live_rows']} deals live, expected {entry['expected_rows']}")
+
+    def stage_rows(stage, rows):
+        return min(rows, STAGE_MAX_ROWS.get(stage, rows))
+
+    parser = DataParser(use_cache=False)
+    llm = LLMInterface()
+    tree_app = make_tree_app()
+    if tree_app is None:
+        print("No display available; update_deals_tree will be skipped")
+
+    for rows in sizes:
+        dataset = None
+        for fmt in formats:
+            stage = f"parse:{fmt}"
+            n = stage_rows(stage, rows)
+            if fmt == 'pdf':
+                try:
+                    import reportlab  # noqa: F401 - only needed to generate the input
+                except ImportError:
+                    print(f"{stage:>32} skipped (reportlab is needed to generate PDF input)")
+                    continue
+            path = write_deal_book(os.path.join(work_dir, f"deals_{n}.{fmt}"), n)
+            timings, parsed = time_call(lambda: parser.parse_file(path), repeat)
+            record(stage, n, timings, rows, file_bytes=os.path.getsize(path), parsed_rows=len(parsed))
+            if fmt == 'csv':
+                dataset = parsed
+            os.remove(path)
+
+            if fmt == 'pdf':
+                stage = 'parse:pdf_split_tables'
+                n = stage_rows(stage, rows)
+                path = write_deal_book(os.path.join(work_dir, f"deals_{n}_split.pdf"), n,
+                                       pdf_rows_per_page=PDF_SPLIT_ROWS_PER_PAGE)
+                timings, parsed = time_call(lambda: parser.parse_file(path), repeat)
+                record(stage, n, timings, rows, file_bytes=os.path.getsize(path), parsed_rows=len(parsed))
+                os.remove(path)
+
+        if dataset is None:
+            dataset = parser.parse_file(write_deal_book(os.path.join(work_dir, f"deals_{rows}.csv"), rows))
+
+        # A watched file re-exported without its last tenth of deals must lose them from the session
+        reexport = DealDataset(dataset.frame.head(len(dataset) - len(dataset) // 10))
+
+        def reload_source():
+            session = IncrementalDealDataset()
+            session.append(dataset, 'deals.csv')
+            session.append(reexport, 'deals.csv')
+            return session
+
+        timings, session = time_call(reload_source, repeat)
+        record('reload_source', len(dataset), timings, rows, live_rows=len(session),
+               expected_rows=len(reexport))
+
+        timings, analysis = time_call(lambda: llm._mock_analysis(dataset), repeat)
+        record('mock_analysis', len(dataset), timings, rows)
+        flagged_deals = analysis['flagged_deals']
+
+        n = stage_rows('build_analysis_prompt', rows)
+        subset = dataset if n == len(dataset) else DealDataset(dataset.frame.head(n))
+        for prompt_format in PROMPT_FORMATS:
+            prompt_llm = LLMInterface(prompt_format=prompt_format)
+            timings, prompt = time_call(lambda: prompt_llm._build_analysis_prompt(subset), repeat)
+            record(f"build_analysis_prompt:{prompt_format}", n, timings, rows, prompt_chars=len(prompt),
+                   tokens_per_deal=round(prompt_llm.tokens_per_deal(subset), 2))
+            del prompt
+
+        if tree_app is not None:
+            n = stage_rows('update_deals_tree', len(flagged_deals))
+            timings, _ = time_call(lambda: tree_app._update_deals_tree(flagged_deals[:n]), repeat)
+            record('update_deals_tree', n, timings, rows, unit='flagged_deals')
+
+        summary = analysis['summary']
+        exports = [
+            ('export:csv', '.csv', lambda path, deals: export_csv(path, deals, summary)),
+            ('export:xlsx', '.xlsx', lambda path, deals: export_excel(path, deals, summary, len(dataset))),
+            ('export:json', '.json', lambda path, deals: export_json(path, dict(analysis, flagged_deals=deals),
+                                                                       len(dataset))),
+        ]
+        for stage, suffix, export in exports:
+            n = stage_rows(stage, len(flagged_deals))
+            path = os.path.join(work_dir, f"report{suffix}")
+            timings, _ = time_call(lambda: export(path, flagged_deals[:n]), repeat)
+            record(stage, n, timings, rows, unit='flagged_deals', file_bytes=os.path.getsize(path))
+            os.remove(path)
+
+    return results
+
+
+def environment():
+    """Describe the machine and commit a run was made on"""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                                text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+    }
+
+
+def compare(results, baseline_path):
+    """Print each stage's best time against a previous run"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {(r['stage'], r['requested_rows'], r['rows']): r['best'] for r in baseline['results']}
+
+    print(f"\nCompared with {baseline_path} (commit {baseline['environment'].get('commit')})")
+    regressions = 0
+    for r in results:
+        before = previous.get((r['stage'], r['requested_rows'], r['rows']))
+        if not before:
+            continue
+        ratio = r['best'] / before
+        flag = ''
+        if ratio > REGRESSION_THRESHOLD:
+            flag = '  <-- slower'
+            regressions += 1
+        print(f"{r['stage']:>32} {r['rows']:>10} rows  {before:9.4f}s -> {r['best']:9.4f}s  {ratio:6.2f}x{flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time the Revenue Watchdog pipeline on synthetic deal books.")
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000],
+                        help="deal book sizes to benchmark (default: 10000 100000; up to 10M)")
+    parser.add_argument('--formats', nargs='+', choices=PARSE_FORMATS, default=PARSE_FORMATS,
+                        help="input formats to time parse_file on")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per stage (default: 3)")
+    parser.add_argument('--output', default='bench_results.json', help="where to write the JSON results")
+    parser.add_argument('--baseline', help="earlier results file to compare against")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='watchdog_bench_') as work_dir:
+        results = run_suite(args.rows, args.formats, args.repeat, work_dir)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump({'environment': environment(), 'results': results}, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        return 1 if compare(results, args.baseline) else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Local fake of an OpenAI-compatible chat completions endpoint
+
+Answers /chat/completions with a well-formed analysis of the deal IDs found
+in the prompt, after a fixed latency. It can enforce its own rate limit
+(429 with Retry-After) and fail a share of requests with 503, so the LLM
+client's throttling and retries can be exercised without a real provider.
+GET /stats returns what the server has seen.
+
+Usage:
+    python benchmarks/fake_llm.py --port 8765 --limit 10 --window 5 --error-rate 0.1
+    python cli.py deals.csv --api-key test --base-url http://127.0.0.1:8765
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEAL_ID_PATTERN = re.compile(r'DEAL_\d+')
+
+
+class FakeLLMServer:
+    """A fake completions endpoint on a background thread.
+
+    ``limit`` requests are accepted per ``window`` seconds (0 for no limit);
+    beyond that the server answers 429, with a Retry-After header unless
+    ``retry_after`` is False. ``error_rate`` of the accepted requests fail
+    with 503 and no Retry-After.
+    """
+
+    def __init__(self, port: int = 0, latency: float = 0.05, limit: int = 0, window: float = 60,
+                 retry_after: bool = True, error_rate: float = 0.0, seed: int = 42):
+        self.latency = latency
+        self.limit = limit
+        self.window = window
+        self.retry_after = retry_after
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._accepted = deque()
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'completed': 0, 'rate_limited': 0, 'failed': 0,
+                      'in_flight': 0, 'max_in_flight': 0}
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self) -> 'FakeLLMServer':
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _admit(self):
+        """Decide one request's fate: (status, Retry-After seconds or None)"""
+        with self._lock:
+            self.stats['requests'] += 1
+            now = time.monotonic()
+            while self._accepted and now - self._accepted[0] >= self.window:
+                self._accepted.popleft()
+            if self.limit and len(self._accepted) >= self.limit:
+                self.stats['rate_limited'] += 1
+                wait = self.window - (now - self._accepted[0])
+                return 429, (math.ceil(wait) if self.retry_after else None)
+            self._accepted.append(now)
+            if self._random.random() < self.error_rate:
+                self.stats['failed'] += 1
+                return 503, None
+            self.stats['in_flight'] += 1
+            self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self.stats['in_flight'])
+            return 200, None
+
+    def _complete(self, prompt: str) -> dict:
+        time.sleep(self.latency)
+        deal_ids = list(dict.fromkeys(DEAL_ID_PATTERN.findall(prompt)))
+        flagged = [{'deal_id': deal_id, 'risk_type': 'unauthorized_discount', 'impact': 1000,
+                    'suggestion': 'Review approval process'} for deal_id in deal_ids[::10]]
+        analysis = {
+            'summary': {'total_leakage': 1000 * len(flagged), 'high_risk_deals': len(flagged),
+                        'issues_found': len(flagged)},
+            'flagged_deals': flagged,
+            'recommendations': ['Implement discount approval workflow'],
+        }
+        with self._lock:
+            self.stats['in_flight'] -= 1
+            self.stats['completed'] += 1
+        return {'choices': [{'message': {'role': 'assistant', 'content': json.dumps(analysis)}}]}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, status, body, headers=None):
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                if self.path.rstrip('/').endswith('/stats'):
+                    with server._lock:
+                        self._send_json(200, dict(server.stats))
+                else:
+                    self._send_json(404, {'error': 'not found'})
+
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                if not self.path.rstrip('/').endswith('/chat/completions'):
+                    self._send_json(404, {'error': 'not found'})
+                    return
+                status, retry_after = server._admit()
+                if status == 429:
+                    headers = {'Retry-After': str(retry_after)} if retry_after is not None else None
+                    self._send_json(429, {'error': 'rate limit exceeded'}, headers)
+                elif status == 503:
+                    self._send_json(503, {'error': 'temporarily unavailable'})
+                else:
+                    prompt = json.loads(body)['messages'][0]['content']
+                    self._send_json(200, server._complete(prompt))
+
+        return Handler
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve a fake chat completions endpoint for local testing.")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.2, help="seconds per completion (default: 0.2)")
+    parser.add_argument('--limit', type=int, default=0, help="requests accepted per window (default: no limit)")
+    parser.add_argument('--window', type=float, default=60, help="rate limit window in seconds (default: 60)")
+    parser.add_argument('--no-retry-after', action='store_true', help="send 429s without a Retry-After header")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="share of requests failed with 503")
+    args = parser.parse_args(argv)
+
+    server = FakeLLMServer(args.port, args.latency, args.limit, args.window,
+                           not args.no_retry_after, args.error_rate)
+    print(f"Fake LLM endpoint at {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Deterministic synthetic deal books for benchmarks
+
+The same (rows, seed) always produces the same deals, chunk for chunk, so
+timings from different commits are measured on identical input. Books are
+generated and written in chunks, which keeps memory flat up to 10M rows.
+"""
+
+import bz2
+import gzip
+import os
+from typing import Iterator, List
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 250000
+XLSX_MAX_ROWS = 1048575  # Excel sheet limit, less the header row
+PDF_ROWS_PER_PAGE = 20  # About 24 rows fit a landscape letter page at font size 7
+
+CUSTOMERS = [f"{prefix} {suffix}" for prefix in
+             ['Acme', 'Globex', 'Initech', 'Umbrella', 'Hooli', 'Stark', 'Wayne', 'Wonka', 'Tyrell', 'Cyberdyne',
+              'Soylent', 'Aperture', 'Vandelay', 'Gringotts', 'Oscorp', 'Massive Dynamic']
+             for suffix in ['Corp', 'Ltd', 'GmbH', 'Inc', 'Group', 'Holdings']]
+STATUSES = ['Open', 'Negotiation', 'Proposal', 'Closed Won', 'Closed Lost']
+STATUS_WEIGHTS = [0.35, 0.2, 0.15, 0.2, 0.1]
+DISCOUNTS = [0, 5, 10, 12.5, 15, 20, 22.5, 25, 30, 40]
+DISCOUNT_WEIGHTS = [0.3, 0.2, 0.15, 0.05, 0.1, 0.06, 0.04, 0.05, 0.03, 0.02]
+
+# Raw export headers, as a CRM would write them; the parser maps them to deal fields
+HEADER = ['Deal ID', 'Client', 'Deal Value', 'Discount %', 'Close Date', 'Renewal', 'Status']
+BASE_DATE = np.datetime64('2023-01-01')
+
+
+def iter_deal_book(rows: int, seed: int = 42, chunk_rows: int = CHUNK_ROWS) -> Iterator[pd.DataFrame]:
+    """Yield a deal book as raw export frames of at most ``chunk_rows`` rows"""
+    rng = np.random.default_rng(seed)
+    # Customers follow a long tail: a few accounts carry most of the deals
+    customer_weights = 1 / np.arange(1, len(CUSTOMERS) + 1)
+    customer_weights /= customer_weights.sum()
+
+    for start in range(0, rows, chunk_rows):
+        n = min(chunk_rows, rows - start)
+        # Deal sizes are log-normal around ~$25k with a long enterprise tail
+        deal_size = np.round(rng.lognormal(mean=10.1, sigma=1.1, size=n), 2)
+        close_offset = rng.integers(0, 4 * 365, n)
+        close_dates = (BASE_DATE + close_offset).astype(str).astype(object)
+        close_dates[rng.random(n) < 0.05] = ''
+        renewals = (BASE_DATE + close_offset + 365).astype(str).astype(object)
+        renewals[rng.random(n) < 0.6] = ''
+
+        yield pd.DataFrame({
+            'Deal ID': [f"DEAL_{i:07d}" for i in range(start, start + n)],
+            'Client': rng.choice(CUSTOMERS, n, p=customer_weights),
+            'Deal Value': deal_size,
+            'Discount %': rng.choice(DISCOUNTS, n, p=DISCOUNT_WEIGHTS),
+            'Close Date': close_dates,
+            'Renewal': renewals,
+            'Status': rng.choice(STATUSES, n, p=STATUS_WEIGHTS),
+        }, columns=HEADER)
+
+
+def write_deal_book(path: str, rows: int, seed: int = 42, pdf_rows_per_page: int = PDF_ROWS_PER_PAGE) -> str:
+    """Write a deal book in the format given by the file name; returns the path.
+
+    Supports .csv, .txt (pipe-delimited), .csv.gz, .csv.bz2, .xlsx (capped
+    at one sheet) and .pdf (one table per ``pdf_rows_per_page`` rows; needs
+    reportlab). A table too long for its page is split across pages, and
+    the continuation has no header row.
+    """
+    name = os.path.basename(path).lower()
+    if name.endswith('.xlsx'):
+        _write_xlsx(path, min(rows, XLSX_MAX_ROWS), seed)
+    elif name.endswith('.pdf'):
+        _write_pdf(path, rows, seed, pdf_rows_per_page)
+    else:
+        sep = '|' if name.endswith('.txt') else ','
+        if name.endswith('.gz'):
+            stream = gzip.open(path, 'wt', encoding='utf-8', newline='')
+        elif name.endswith('.bz2'):
+            stream = bz2.open(path, 'wt', encoding='utf-8', newline='')
+        else:
+            stream = open(path, 'w', encoding='utf-8', newline='')
+        with stream:
+            for i, chunk in enumerate(iter_deal_book(rows, seed)):
+                chunk.to_csv(stream, sep=sep, index=False, header=(i == 0))
+    return path
+
+
+def _write_xlsx(path: str, rows: int, seed: int):
+    import openpyxl
+
+    workbook = openpyxl.Workbook(write_only=True)
+    sheet = workbook.create_sheet('Deals')
+    sheet.append(HEADER)
+    for chunk in iter_deal_book(rows, seed):
+        for record in chunk.itertuples(index=False):
+            sheet.append(list(record))
+    workbook.save(path)
+
+
+def _write_pdf(path: str, rows: int, seed: int, rows_per_page: int):
+    from reportlab.lib.pagesizes import landscape, letter
+    from reportlab.platypus import PageBreak, SimpleDocTemplate, Table, TableStyle
+
+    style = TableStyle([('GRID', (0, 0), (-1, -1), 0.5, (0, 0, 0)), ('FONTSIZE', (0, 0), (-1, -1), 7)])
+    story: List = []
+    for chunk in iter_deal_book(rows, seed):
+        values = chunk.astype(str).values.tolist()
+        for start in range(0, len(values), rows_per_page):
+            if story:
+                story.append(PageBreak())
+            story.append(Table([HEADER] + values[start:start + rows_per_page], style=style))
+    SimpleDocTemplate(path, pagesize=landscape(letter)).build(story)
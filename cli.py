@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Revenue Leakage & Margin Watchdog - headless batch mode
+
+Parses deal files, analyzes them and writes the same CSV/Excel/JSON reports
+as the GUI, without a display. Suitable for servers and cron jobs.
+
+Usage:
+    python cli.py exports/*.csv archive/2024/ --workers 8 --output-dir reports --format csv json
+"""
+
+import argparse
+import glob
+import os
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from config import (DEFAULT_BASE_URL, INGEST_MAX_WORKERS, CSV_CHUNK_SIZE, PROMPT_FORMAT, LLM_REQUESTS_PER_MINUTE,
+                    LLM_TOKENS_PER_MINUTE)
+from utils.helpers import format_currency
+from utils.profiling import Profiler
+
+REPORT_FORMATS = {'csv': '.csv', 'json': '.json', 'xlsx': '.xlsx'}
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    """Describe the command-line options"""
+    parser = argparse.ArgumentParser(
+        description="Analyze deal files for revenue leakage without the GUI."
+    )
+    parser.add_argument('inputs', nargs='+',
+                        help="deal files, directories or glob patterns (quote ** patterns)")
+    parser.add_argument('-w', '--workers', type=int, default=INGEST_MAX_WORKERS,
+                        help="files parsed in parallel (default: one per CPU core)")
+    parser.add_argument('--chunk-size', type=int, default=CSV_CHUNK_SIZE,
+                        help=f"rows typed per batch when reading CSV/TXT/XLSX (default: {CSV_CHUNK_SIZE}; "
+                             "0 reads each file in one pass)")
+    parser.add_argument('-o', '--output-dir', default='.',
+                        help="directory for the reports (default: current directory)")
+    parser.add_argument('-f', '--format', nargs='+', choices=sorted(REPORT_FORMATS), default=['csv', 'json'],
+                        dest='formats', help="report formats to write (default: csv json)")
+    parser.add_argument('--name', default='leakage_report',
+                        help="report file name without extension (default: leakage_report)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="parse every file instead of reusing cached results")
+    parser.add_argument('--no-response-cache', action='store_true',
+                        help="send every batch to the LLM instead of reusing cached replies")
+    parser.add_argument('--api-key', default=os.environ.get('OPENROUTER_API_KEY', ''),
+                        help="LLM API key (default: $OPENROUTER_API_KEY; rule-based analysis without one)")
+    parser.add_argument('--base-url', default=DEFAULT_BASE_URL,
+                        help=f"LLM API base URL (default: {DEFAULT_BASE_URL})")
+    parser.add_argument('--requests-per-minute', type=float, default=LLM_REQUESTS_PER_MINUTE,
+                        help=f"LLM requests allowed per minute (default: {LLM_REQUESTS_PER_MINUTE}; 0 for no limit)")
+    parser.add_argument('--tokens-per-minute', type=float, default=LLM_TOKENS_PER_MINUTE,
+                        help=f"estimated prompt tokens allowed per minute (default: {LLM_TOKENS_PER_MINUTE}; "
+                             "0 for no limit)")
+    parser.add_argument('--profile-memory', action='store_true',
+                        help="also trace each stage's peak Python memory, beyond the process high-water mark "
+                             "(slows allocation-heavy stages)")
+    parser.add_argument('--prompt-format', choices=['compact', 'json'], default=PROMPT_FORMAT,
+                        help=f"how deals are written into LLM prompts (default: {PROMPT_FORMAT})")
+    return parser
+
+
+def expand_inputs(inputs: List[str]) -> List[str]:
+    """Resolve files, directories and glob patterns to parseable files, in order, without repeats"""
+    from core.data_parser import DataParser
+
+    parser = DataParser(use_cache=False)
+    file_paths = []
+    for pattern in inputs:
+        matches = sorted(glob.glob(pattern, recursive=True)) or [pattern]
+        for match in matches:
+            if os.path.isdir(match):
+                file_paths.extend(
+                    str(path) for path in sorted(Path(match).iterdir())
+                    if path.is_file() and parser.can_parse(str(path))
+                )
+            else:
+                file_paths.append(match)
+    return list(dict.fromkeys(file_paths))
+
+
+def run(args: argparse.Namespace) -> int:
+    """Parse, analyze and export; returns the process exit code"""
+    from core.deal_dataset import IncrementalDealDataset
+    from core.exporters import export_results
+    from core.ingest import parse_files_parallel
+    from core.llm_interface import LLMInterface
+
+    file_paths = expand_inputs(args.inputs)
+    if not file_paths:
+        print("No input files found", file=sys.stderr)
+        return 1
+
+    # Parse across a process pool, then append in input order so later files
+    # win when the same deal appears in more than one export
+    profiler = Profiler(trace_memory=args.profile_memory)
+    parser_options = {'use_cache': not args.no_cache, 'chunk_size': args.chunk_size or None}
+    datasets = {}
+    with profiler.stage('parse') as record:
+        for file_path, dataset, error in parse_files_parallel(file_paths, args.workers, parser_options):
+            if error is None:
+                datasets[file_path] = dataset
+            else:
+                print(f"Failed to parse {file_path}: {str(error)}", file=sys.stderr)
+        record['rows'] = sum(len(dataset) for dataset in datasets.values())
+
+    parsed_data = IncrementalDealDataset()
+    replaced = 0
+    with profiler.stage('merge') as record:
+        for file_path in file_paths:
+            if file_path in datasets:
+                replaced += parsed_data.append(datasets[file_path], file_path)[1]
+        record['rows'] = len(parsed_data) + replaced
+
+    print(f"Loaded {len(parsed_data)} deals from {len(datasets)} of {len(file_paths)} file(s)"
+          + (f" ({replaced} duplicate deal(s) merged)" if replaced else ""))
+    if parsed_data.error_count:
+        print(f"{parsed_data.error_count} value(s) could not be parsed and were left blank")
+    if not parsed_data:
+        print("No deals loaded; nothing to analyze", file=sys.stderr)
+        return 1
+
+    llm = LLMInterface(args.api_key, args.base_url, prompt_format=args.prompt_format,
+                       use_cache=not args.no_response_cache, requests_per_minute=args.requests_per_minute,
+                       tokens_per_minute=args.tokens_per_minute)
+    analysis_results = llm.analyze_deals(parsed_data, profiler)
+    summary = analysis_results.get('summary', {})
+    print(f"Total estimated leakage: {format_currency(summary.get('total_leakage', 0))} "
+          f"across {summary.get('issues_found', 0)} issue(s)")
+    for error in analysis_results.get('errors', []):
+        print(f"Batch {error['batch']} ({error['deals']} deals) fell back to rule-based analysis: {error['error']}",
+              file=sys.stderr)
+    connections = llm.timings.to_dict()
+    if connections['requests']:
+        connect_ms = (connections['avg_connect_s'] or 0) * 1000
+        print(f"LLM requests: {connections['requests']} over {connections['connections']} new connection(s), "
+              f"connect {connect_ms:.0f} ms avg, first byte {connections['avg_ttfb_s'] * 1000:.0f} ms avg")
+    llm.close()
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for report_format in args.formats:
+        report_path = output_dir / f"{args.name}{REPORT_FORMATS[report_format]}"
+        try:
+            with profiler.stage(f"export_{report_format}", rows=len(analysis_results.get('flagged_deals', []))):
+                export_results(str(report_path), analysis_results, len(parsed_data), profiler.to_dict())
+        except Exception as e:
+            print(f"Failed to write {report_path}: {str(e)}", file=sys.stderr)
+            return 1
+        print(f"Wrote {report_path}")
+
+    print(f"Timings: {profiler.summary()}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command-line entry point"""
+    return run(build_arg_parser().parse_args(argv))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
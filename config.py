@@ -2,15 +2,73 @@
 Configuration constants for Revenue Watchdog application
 """
 
+import os
+
 # API Configuration
 DEFAULT_BASE_URL = "https://openrouter.ai/api/v1"
 DEFAULT_MODEL = "mistralai/mistral-7b-instruct"
 API_TIMEOUT = 30
 
+# LLM Batching
+LLM_MAX_TOKENS = 4000  # Completion tokens requested per call
+LLM_BATCH_TOKEN_BUDGET = 6000  # Prompt tokens of deal data per request
+LLM_BATCH_MAX_DEALS = 400  # Caps a batch so its flagged deals fit in LLM_MAX_TOKENS
+LLM_MAX_CONCURRENCY = 4  # Batches sent to the API at the same time
+CHARS_PER_TOKEN = 4  # Rough size of a token, for budgeting prompts without a tokenizer
+
+# LLM Connection Pool
+LLM_KEEPALIVE_IDLE = 30  # Seconds a pooled connection sits idle before TCP keep-alive probes start
+LLM_KEEPALIVE_INTERVAL = 10  # Seconds between keep-alive probes
+LLM_KEEPALIVE_PROBES = 3  # Unanswered probes before the connection is dropped
+
+# LLM Rate Limits
+LLM_REQUESTS_PER_MINUTE = 60  # 0 disables the limit
+LLM_TOKENS_PER_MINUTE = 200000  # Estimated prompt tokens; 0 disables the limit
+LLM_MAX_RETRIES = 5  # Retries of a batch after a 429, 5xx, timeout or dropped connection
+LLM_BACKOFF_BASE = 1.0  # Seconds; the backoff ceiling doubles on each retry
+LLM_BACKOFF_MAX = 60.0
+LLM_RETRY_MAX_WAIT = 120  # Longest Retry-After honored; a longer one fails the batch
+
+# LLM Response Cache
+LLM_TEMPERATURE = 0.1
+PROMPT_TEMPLATE_VERSION = 1  # Bump whenever the analysis prompt wording changes to invalidate cached replies
+LLM_CACHE_ENABLED = True
+LLM_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.revenue_watchdog', 'cache', 'responses')
+LLM_CACHE_MAX_BYTES = 256 * 1024 ** 2
+LLM_CACHE_MAX_AGE = 7 * 24 * 3600  # Seconds a reply stays valid after it was cached
+
+# Prompt Serialization
+PROMPT_FORMAT = 'compact'  # 'compact' (header-once table) or 'json' (pretty-printed records)
+PROMPT_FIELDS = ['deal_id', 'customer_name', 'deal_size', 'unit_price', 'discount_percent', 'close_date', 'renewal',
+                 'deal_status']  # Fields missing from a book are left out of its prompts
+PROMPT_DECIMALS = {'deal_size': 0, 'unit_price': 2, 'discount_percent': 1}
+PROMPT_TEXT_MAX_CHARS = 40  # Longer free text is truncated in compact prompts
+
 # File Processing
-SUPPORTED_FORMATS = ['.csv', '.txt', '.pdf']
+SUPPORTED_FORMATS = ['.csv', '.txt', '.pdf', '.xlsx']
+COMPRESSED_FORMATS = ['.gz', '.bz2', '.zst', '.zip']
+STREAMABLE_FORMATS = ['.csv', '.txt']  # Formats readable from a decompressing stream
 MAX_PDF_AMOUNTS = 5
 MIN_DEAL_AMOUNT = 1000
+PDF_PAGE_WORKERS = None  # Processes extracting PDF pages; None uses every CPU core
+PDF_PAGES_PER_TASK = 16
+PDF_PARALLEL_MIN_PAGES = 32  # Shorter PDFs are extracted serially
+EXCEL_SHEET_WORKERS = None  # Processes reading workbook sheets; None uses every CPU core
+CSV_CHUNK_SIZE = 50000  # Rows per batch when streaming large CSV files
+TXT_SNIFF_BYTES = 64 * 1024  # Sample size used to detect the delimiter of TXT files
+TXT_DELIMITERS = ',\t;|'
+INGEST_MAX_WORKERS = None  # Parallel file parsers; None uses every CPU core
+
+# Parse Cache
+PARSER_VERSION = 8  # Bump whenever parsing output changes to invalidate cached results
+PARSE_CACHE_ENABLED = True
+PARSE_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.revenue_watchdog', 'cache', 'parsed')
+PARSE_CACHE_MAX_BYTES = 2 * 1024 ** 3
+
+# Watched Folders
+WATCH_POLL_INTERVAL_MS = 5000  # How often a watched folder is scanned for new or changed files
+WATCH_SETTLE_SECONDS = 2  # Files modified more recently than this may still be being written
+WATCH_INDEX_DIR = os.path.join(os.path.expanduser('~'), '.revenue_watchdog', 'watch')
 
 # Data Processing
 COLUMN_MAPPING = {
@@ -38,13 +96,32 @@ STANDARD_FIELDS = {
     'deal_status': 'Open'
 }
 
+KEEP_EXTRA_COLUMNS = False  # Read only columns that map onto known deal fields
+SCHEMA_CACHE_SIZE = 64  # Distinct header layouts remembered by the schema resolver
+
+# Fields parsed into datetime columns at ingestion
+DATE_FIELDS = ['close_date', 'renewal']
+
+# Column types applied to parsed deals; dates are covered by DATE_FIELDS
+DEAL_DTYPES = {
+    'customer_name': 'category',
+    'deal_size': 'float64',
+    'discount_percent': 'float32',
+    'unit_price': 'float64',
+    'deal_status': 'category'
+}
+
 # Analysis Rules
 HIGH_DISCOUNT_THRESHOLD = 20  # Percentage
 OPPORTUNITY_COST_FACTOR = 0.1
 
+# Instrumentation
+PROFILE_MEMORY = False  # Track peak Python memory per stage with tracemalloc; slows allocation-heavy stages several-fold
+
 # UI Configuration
 WINDOW_SIZE = "1000x700"
 APP_TITLE = "Revenue Leakage & Margin Watchdog"
+UI_POLL_INTERVAL_MS = 100  # How often the UI checks background work for updates
 
 # Export Settings
 EXPORT_COMMENT_PREFIX = "#"
@@ -4,7 +4,21 @@
 Core business logic modules for Revenue Watchdog
 """
 
-from .data_parser import DataParser
-from .llm_interface import LLMInterface
+import importlib
 
-__all__ = ['DataParser', 'LLMInterface']
\ No newline at end of file
+# Exports are imported on first access, so importing one core module does not
+# drag in pandas, requests and the PDF/Excel backends through the others
+_EXPORTS = {
+    'DataParser': '.data_parser',
+    'DealDataset': '.deal_dataset',
+    'IncrementalDealDataset': '.deal_dataset',
+    'LLMInterface': '.llm_interface'
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,269 @@
+"""
+Cache module for Revenue Watchdog
+On-disk caches keyed by content hash, with size-bounded LRU eviction
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from config import (PARSER_VERSION, PARSE_CACHE_DIR, PARSE_CACHE_MAX_BYTES, PROMPT_TEMPLATE_VERSION,
+                    LLM_CACHE_DIR, LLM_CACHE_MAX_BYTES, LLM_CACHE_MAX_AGE)
+from .deal_dataset import DealDataset
+
+HASH_BLOCK_SIZE = 1024 * 1024
+HASH_MEMO_NAME = 'file_hashes.json'
+HASH_MEMO_MAX_ENTRIES = 2000
+# Eviction trims a full cache to this share of its bound, so the next scan is a while off
+EVICT_TARGET_RATIO = 0.9
+
+
+def hash_file(file_path: str) -> str:
+    """Return a content hash of a file, read in fixed-size blocks"""
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_key(*parts: Any) -> str:
+    """Combine key parts into a single cache key"""
+    digest = hashlib.blake2b(digest_size=20)
+    for part in parts:
+        digest.update(repr(part).encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _atomic_write(directory: Path, path: Path, data: bytes):
+    """Write ``data`` to ``path`` through a temporary file so readers never see a partial file"""
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+class DiskCache:
+    """Directory of cache entries bounded by total size.
+
+    Entry modification times double as last-access times: reads touch the
+    entry, and eviction removes the oldest entries first. The total size is
+    scanned once, then kept as a running count, so the directory is only
+    scanned again when a write takes it past the bound. Every eviction scan
+    recounts the total, which picks up entries that other processes wrote.
+    """
+
+    suffix = '.bin'
+
+    def __init__(self, cache_dir: str, max_bytes: int):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._total_bytes = None
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{self.suffix}"
+
+    def _entries(self) -> Iterable[os.DirEntry]:
+        with os.scandir(self.cache_dir) as entries:
+            return [entry for entry in entries if entry.name.endswith(self.suffix)]
+
+    def _read(self, key: str) -> Optional[bytes]:
+        """Return the raw bytes stored under ``key`` and mark it as used"""
+        path = self._path(key)
+        try:
+            data = path.read_bytes()
+            os.utime(path)
+        except OSError:
+            return None
+        return data
+
+    def _write(self, key: str, data: bytes):
+        """Store bytes under ``key`` atomically, then enforce the size bound"""
+        path = self._path(key)
+        if self._total_bytes is None:
+            self._total_bytes = sum(self._entry_size(entry) for entry in self._entries())
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        _atomic_write(self.cache_dir, path, data)
+        self._total_bytes += len(data) - replaced
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    @staticmethod
+    def _entry_size(entry: os.DirEntry) -> int:
+        try:
+            return entry.stat().st_size
+        except OSError:
+            return 0
+
+    def evict(self, max_age: Optional[float] = None):
+        """Remove expired entries, then least recently used ones until comfortably under the size bound"""
+        entries = []
+        now = time.time()
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if max_age is not None and now - stat.st_mtime > max_age:
+                self._remove(entry.path)
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * EVICT_TARGET_RATIO if total > self.max_bytes else self.max_bytes
+        for _, size, path in sorted(entries):
+            if total <= target:
+                break
+            self._remove(path)
+            total -= size
+        self._total_bytes = total
+
+    def clear(self):
+        """Remove every entry"""
+        for entry in self._entries():
+            self._remove(entry.path)
+        self._total_bytes = 0
+
+    def _remove(self, path: str):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+class ParseCache(DiskCache):
+    """Cache of parsed deal datasets keyed by file content and parser version.
+
+    Entries are pickled DataFrames, which store each column block as a raw
+    NumPy buffer and load without re-parsing any text. Content hashes are
+    memoized per path with the file's size and mtime, like FolderWatcher's
+    index, so a hit on an unchanged file costs a stat instead of a read of
+    the whole file.
+    """
+
+    suffix = '.parsed'
+
+    def __init__(self, cache_dir: str = PARSE_CACHE_DIR, max_bytes: int = PARSE_CACHE_MAX_BYTES):
+        super().__init__(cache_dir, max_bytes)
+        self.memo_path = self.cache_dir / HASH_MEMO_NAME
+
+    def key_for(self, file_path: str, *options: Any) -> str:
+        """Build the cache key for a file under the given parser options"""
+        return hash_key(PARSER_VERSION, Path(file_path).suffix.lower(), self.file_hash(file_path), *options)
+
+    def file_hash(self, file_path: str) -> str:
+        """Content hash of a file, reusing the memoized one while its size and mtime are unchanged"""
+        path = os.path.abspath(file_path)
+        # Stat before hashing: a write during the read changes the mtime, so the next call hashes again
+        stat = os.stat(path)
+        known = self._load_memo().get(path)
+        if known and known['mtime_ns'] == stat.st_mtime_ns and known['size'] == stat.st_size:
+            return known['hash']
+
+        content_hash = hash_file(path)
+        # Re-read so entries added meanwhile by other parser processes are kept
+        memo = self._load_memo()
+        memo.pop(path, None)
+        memo[path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'hash': content_hash}
+        for stale in list(memo)[:max(0, len(memo) - HASH_MEMO_MAX_ENTRIES)]:
+            del memo[stale]
+        try:
+            _atomic_write(self.cache_dir, self.memo_path, json.dumps(memo).encode('utf-8'))
+        except OSError:
+            pass
+        return content_hash
+
+    def _load_memo(self) -> dict:
+        """Path -> {mtime_ns, size, hash} of recently hashed files"""
+        try:
+            with open(self.memo_path, 'r', encoding='utf-8') as f:
+                memo = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return memo if isinstance(memo, dict) else {}
+
+    def clear(self):
+        """Remove every entry and the hash memo"""
+        super().clear()
+        self._remove(str(self.memo_path))
+
+    def get(self, key: str) -> Optional[DealDataset]:
+        """Return the cached dataset for ``key``, if any"""
+        data = self._read(key)
+        if data is None:
+            return None
+        try:
+            entry = pickle.loads(data)
+            return DealDataset(entry['frame'], entry['parse_errors'], entry['generated_ids'])
+        except Exception:
+            # Unreadable entry (e.g. written by another pandas version)
+            self._remove(str(self._path(key)))
+            return None
+
+    def put(self, key: str, dataset: DealDataset):
+        """Store a parsed dataset under ``key``"""
+        entry = {
+            'frame': dataset.frame,
+            'parse_errors': dataset.parse_errors,
+            'generated_ids': dataset.generated_ids
+        }
+        self._write(key, pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+class ResponseCache(DiskCache):
+    """Cache of LLM replies keyed by model, temperature, prompt template and prompt text.
+
+    A reply expires ``max_age`` seconds after it was stored, however often
+    it is read, so cached analyses never outlive model or policy changes
+    by more than that.
+    """
+
+    suffix = '.reply'
+
+    def __init__(self, cache_dir: str = LLM_CACHE_DIR, max_bytes: int = LLM_CACHE_MAX_BYTES,
+                 max_age: Optional[float] = LLM_CACHE_MAX_AGE):
+        super().__init__(cache_dir, max_bytes)
+        self.max_age = max_age
+
+    def key_for(self, model: str, temperature: float, prompt: str) -> str:
+        """Build the cache key for one request"""
+        return hash_key(PROMPT_TEMPLATE_VERSION, model, temperature, prompt)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached reply text for ``key``, if any and not expired"""
+        data = self._read(key)
+        if data is None:
+            return None
+        try:
+            entry = json.loads(data)
+            expired = self.max_age is not None and time.time() - entry['created'] > self.max_age
+        except (ValueError, KeyError, TypeError):
+            expired = True
+        if expired:
+            self._remove(str(self._path(key)))
+            return None
+        return entry['content']
+
+    def put(self, key: str, content: str):
+        """Store a reply under ``key``"""
+        entry = {'created': time.time(), 'content': content}
+        self._write(key, json.dumps(entry).encode('utf-8'))
+
+    def evict(self, max_age: Optional[float] = None):
+        """Remove entries unused for longer than the reply lifetime, then enforce the size bound"""
+        super().evict(self.max_age if max_age is None else max_age)
@@ -1,101 +1,373 @@
 """
 Data parsing module for Revenue Watchdog
-Handles file ingestion and data parsing for CSV, TXT, and PDF files
+Handles file ingestion and data parsing for CSV, TXT, Excel, and PDF files
 """
 
 import pandas as pd
+import bz2
+import csv
+import gzip
 import os
-import sys
+import pickle
 import re
-import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, BinaryIO, Callable, Iterator, Optional, Tuple
 
-from config import SUPPORTED_FORMATS, COLUMN_MAPPING, STANDARD_FIELDS, MIN_DEAL_AMOUNT, MAX_PDF_AMOUNTS
+from config import (SUPPORTED_FORMATS, STANDARD_FIELDS, MIN_DEAL_AMOUNT, MAX_PDF_AMOUNTS,
+                    CSV_CHUNK_SIZE, DATE_FIELDS, DEAL_DTYPES, TXT_SNIFF_BYTES, TXT_DELIMITERS, PARSE_CACHE_ENABLED,
+                    KEEP_EXTRA_COLUMNS, PDF_PAGE_WORKERS, PDF_PAGES_PER_TASK, PDF_PARALLEL_MIN_PAGES,
+                    EXCEL_SHEET_WORKERS, COMPRESSED_FORMATS, STREAMABLE_FORMATS)
+from utils.helpers import infer_date_format, parse_date_column, blank_mask
+from .cache import ParseCache
+from .deal_dataset import DealDataset
+from .schema import ColumnPlan, SchemaResolver, default_resolver
 
 # Optional PDF processing imports
 try:
     import PyPDF2
-    PDF_AVAILABLE = True
+    PYPDF2_AVAILABLE = True
 except ImportError:
+    PYPDF2_AVAILABLE = False
+
+try:
+    import pdfplumber
+    PDFPLUMBER_AVAILABLE = True
+except ImportError:
+    PDFPLUMBER_AVAILABLE = False
+
+# Optional compression imports
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+# Optional Excel processing imports
+try:
+    import openpyxl
+    EXCEL_AVAILABLE = True
+except ImportError:
+    EXCEL_AVAILABLE = False
+
+PDF_AVAILABLE = PYPDF2_AVAILABLE or PDFPLUMBER_AVAILABLE
+
+
+# Zero-argument callable returning a fresh binary stream over a file's contents
+Opener = Callable[[], BinaryIO]
+
+# A PDF table or worksheet must resolve at least one of these to be treated as deal data
+DEAL_KEY_FIELDS = {'deal_id', 'deal_size', 'customer_name'}
+
+PDF_AMOUNT_PATTERN = re.compile(r'\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)')
+
+# Content stream operators that draw lines, rectangles or curves, or paint a
+# form XObject that might; pdfplumber only finds tables along such ruling
+PDF_RULING_PATTERN = re.compile(rb'(?:^|\s)(?:re|l|c|v|y|Do)(?=\s|$)')
+
+
+def _extract_page_range(file_path: str, start: int, stop: int) -> List[str]:
+    """Extract the text of pages [start, stop) of a PDF; runs in pool workers"""
+    with open(file_path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        return [reader.pages[i].extract_text() or '' for i in range(start, stop)]
+
+
+def _ruled_pages(file_path: str) -> Optional[List[bool]]:
+    """Flag the pages whose raw content stream draws any ruling; None when it cannot be read"""
+    if not PYPDF2_AVAILABLE:
+        return None
     try:
-        import pdfplumber
-        PDF_AVAILABLE = True
-    except ImportError:
-        PDF_AVAILABLE = False
+        with open(file_path, 'rb') as f:
+            ruled = []
+            for page in PyPDF2.PdfReader(f).pages:
+                contents = page.get_contents()
+                ruled.append(contents is not None and PDF_RULING_PATTERN.search(contents.get_data()) is not None)
+            return ruled
+    except Exception:
+        return None
+
+
+def _parse_sheet_in_worker(file_path: str, sheet_name: str, parser_options: Dict[str, Any]) -> Optional[DealDataset]:
+    """Parse one worksheet; runs in pool workers"""
+    return DataParser(**parser_options)._parse_sheet(file_path, sheet_name)
+
+
+def _open_compressed(file_path: str, compression: str) -> BinaryIO:
+    """Open a compressed file as a decompressing binary stream"""
+    if compression == '.gz':
+        return gzip.open(file_path, 'rb')
+    if compression == '.bz2':
+        return bz2.open(file_path, 'rb')
+    if compression == '.zst':
+        if not ZSTD_AVAILABLE:
+            raise Exception("Zstandard files require zstandard. Install with: pip install zstandard")
+        return zstandard.ZstdDecompressor().stream_reader(open(file_path, 'rb'), closefd=True)
+    raise ValueError(f"Unsupported compression: {compression}")
 
 
 class DataParser:
     """Handles file ingestion and data parsing"""
     
-    def __init__(self):
+    def __init__(self, use_cache: bool = PARSE_CACHE_ENABLED, keep_extra_columns: bool = KEEP_EXTRA_COLUMNS,
+                 schema_resolver: Optional[SchemaResolver] = None, pdf_workers: Optional[int] = PDF_PAGE_WORKERS,
+                 sheet_workers: Optional[int] = EXCEL_SHEET_WORKERS, chunk_size: Optional[int] = None):
         self.supported_formats = SUPPORTED_FORMATS
+        self.keep_extra_columns = keep_extra_columns
+        # Rows typed per batch when reading CSV/TXT files; None reads each file in one pass
+        self.chunk_size = chunk_size
+        self.pdf_workers = pdf_workers or os.cpu_count() or 1
+        self.sheet_workers = sheet_workers or os.cpu_count() or 1
+        self.schema_resolver = schema_resolver or default_resolver
+        self.cache = self._open_cache() if use_cache else None
+    
+    def _open_cache(self) -> Optional[ParseCache]:
+        """Open the on-disk parse cache, or run uncached if it is unavailable"""
+        try:
+            return ParseCache()
+        except OSError:
+            return None
         
-    def parse_file(self, file_path: str) -> List[Dict[str, Any]]:
+    def parse_file(self, file_path: str) -> DealDataset:
         """Parse uploaded file and extract deal data"""
-        file_ext = Path(file_path).suffix.lower()
+        compression, file_ext = self._file_format(file_path)
+        if self.cache is None or not self._is_supported(compression, file_ext):
+            return self._parse_uncached(file_path)
+        
+        # Unchanged files are served from the content-addressed cache
+        try:
+            cache_key = self.cache.key_for(file_path, compression, file_ext, self.keep_extra_columns)
+        except OSError as e:
+            raise Exception(f"Error parsing {file_path}: {str(e)}")
+        
+        dataset = self.cache.get(cache_key)
+        if dataset is None:
+            dataset = self._parse_uncached(file_path)
+            try:
+                self.cache.put(cache_key, dataset)
+            except (OSError, pickle.PicklingError):
+                pass
+        return dataset
+    
+    def _file_format(self, file_path: str) -> Tuple[Optional[str], str]:
+        """Split a path into its compression suffix (if any) and data format"""
+        suffixes = [suffix.lower() for suffix in Path(file_path).suffixes]
+        if not suffixes:
+            return None, ''
+        if suffixes[-1] == '.zip':
+            return '.zip', '.zip'
+        if suffixes[-1] in COMPRESSED_FORMATS:
+            return suffixes[-1], suffixes[-2] if len(suffixes) > 1 else ''
+        return None, suffixes[-1]
+    
+    def can_parse(self, file_path: str) -> bool:
+        """Whether a file's name marks it as a format this parser reads"""
+        return self._is_supported(*self._file_format(file_path))
+    
+    def _is_supported(self, compression: Optional[str], file_ext: str) -> bool:
+        """Whether a compression/format pair can be parsed"""
+        if compression is None:
+            return file_ext in self.supported_formats
+        return compression == '.zip' or file_ext in STREAMABLE_FORMATS
+    
+    def _parse_uncached(self, file_path: str) -> DealDataset:
+        """Dispatch a file to the parser for its format"""
+        compression, file_ext = self._file_format(file_path)
         
         try:
-            if file_ext == '.csv':
+            if compression == '.zip':
+                return self._parse_zip(file_path)
+            elif compression is not None:
+                if file_ext not in STREAMABLE_FORMATS:
+                    raise ValueError(f"Unsupported compressed file format: {file_ext or 'unknown'}{compression}")
+                opener = lambda: _open_compressed(file_path, compression)
+                return self._parse_delimited(file_path, file_ext, opener)
+            elif file_ext == '.csv':
                 return self._parse_csv(file_path)
             elif file_ext == '.txt':
                 return self._parse_txt(file_path)
             elif file_ext == '.pdf':
                 return self._parse_pdf(file_path)
+            elif file_ext == '.xlsx':
+                return self._parse_excel(file_path)
             else:
                 raise ValueError(f"Unsupported file format: {file_ext}")
         except Exception as e:
             raise Exception(f"Error parsing {file_path}: {str(e)}")
     
-    def _parse_csv(self, file_path: str) -> List[Dict[str, Any]]:
+    def _parse_csv(self, file_path: str, sep: str = ',', opener: Optional[Opener] = None) -> DealDataset:
         """Parse CSV file containing deal data"""
-        df = pd.read_csv(file_path)
+        if self.chunk_size:
+            # Type each chunk as it is read so raw text never accumulates for the whole file
+            return DealDataset.concat(self.stream_csv(file_path, self.chunk_size, sep, opener))
         
-        # Normalize column names
-        df.columns = [col.lower().replace(' ', '_') for col in df.columns]
+        plan = self._read_plan(file_path, sep, opener)
+        with self._open_source(file_path, opener) as source:
+            df = pd.read_csv(source, sep=sep, usecols=self._usecols(plan), dtype=plan.dtypes)
+        return self._build_dataset(df, plan=plan)
+    
+    def _parse_delimited(self, file_path: str, file_ext: str, opener: Optional[Opener] = None) -> DealDataset:
+        """Parse a CSV or TXT file, optionally read through a decompressing stream"""
+        if file_ext == '.csv':
+            return self._parse_csv(file_path, opener=opener)
+        return self._parse_txt(file_path, opener)
+    
+    def _parse_zip(self, file_path: str) -> DealDataset:
+        """Parse every CSV/TXT member of a zip archive, streaming each member"""
+        datasets = []
+        with zipfile.ZipFile(file_path) as archive:
+            for info in archive.infolist():
+                member_ext = Path(info.filename).suffix.lower()
+                if info.is_dir() or member_ext not in STREAMABLE_FORMATS:
+                    continue
+                opener = lambda name=info.filename: archive.open(name)
+                try:
+                    datasets.append(self._parse_delimited(info.filename, member_ext, opener))
+                except Exception as e:
+                    raise Exception(f"{info.filename}: {str(e)}")
+        
+        if not datasets:
+            raise ValueError("Archive contains no CSV or TXT files")
+        return self._concat_parts(datasets)
+    
+    @contextmanager
+    def _open_source(self, file_path: str, opener: Optional[Opener] = None):
+        """Yield something pandas can read: the path itself, or a fresh stream"""
+        if opener is None:
+            yield file_path
+        else:
+            with opener() as stream:
+                yield stream
+    
+    def stream_csv(self, file_path: str, chunk_size: int = CSV_CHUNK_SIZE, sep: str = ',',
+                   opener: Optional[Opener] = None) -> Iterator[DealDataset]:
+        """Stream a delimited file as batches of normalized deals.
         
-        # Map common column variations to standard names
-        for old_col, new_col in COLUMN_MAPPING.items():
-            if old_col in df.columns and new_col not in df.columns:
-                df.rename(columns={old_col: new_col}, inplace=True)
+        Only one chunk of ``chunk_size`` rows is held in memory at a time, so
+        peak memory is bounded by the chunk size rather than the file size.
+        With ``opener``, the file is read through the stream it returns,
+        e.g. a decompressor or an archive member.
+        """
+        row_offset = 0
+        date_formats = {}
+        plan = self._read_plan(file_path, sep, opener)
+        with self._open_source(file_path, opener) as source:
+            reader = pd.read_csv(source, sep=sep, usecols=self._usecols(plan), dtype=plan.dtypes,
+                                 chunksize=chunk_size)
+            for chunk in reader:
+                yield self._build_dataset(chunk, row_offset, date_formats, plan)
+                row_offset += len(chunk)
+    
+    def _build_dataset(self, df: pd.DataFrame, row_offset: int = 0,
+                       date_formats: Optional[Dict[str, Optional[str]]] = None,
+                       plan: Optional[ColumnPlan] = None, generated_ids: Optional[bool] = None) -> DealDataset:
+        """Normalize a raw frame and type its fields into a dataset"""
+        if generated_ids is None:
+            resolved = plan or self.schema_resolver.resolve(list(df.columns))
+            generated_ids = 'deal_id' not in resolved.columns
+        
+        df = self._normalize_frame(df, row_offset, plan)
+        parse_errors = self._parse_date_fields(df, {} if date_formats is None else date_formats)
+        parse_errors.update(self._apply_schema(df))
+        return DealDataset(df, parse_errors, generated_ids)
+    
+    def _read_plan(self, file_path: str, sep: str = ',', opener: Optional[Opener] = None) -> ColumnPlan:
+        """Resolve the column plan for a delimited file from its header row"""
+        with self._open_source(file_path, opener) as source:
+            header = list(pd.read_csv(source, sep=sep, nrows=0).columns)
+        return self.schema_resolver.resolve(header)
+    
+    def _usecols(self, plan: ColumnPlan) -> Optional[List[str]]:
+        """Columns to pass to the reader, or None to read every column"""
+        if self.keep_extra_columns or not plan.projection:
+            return None
+        return plan.projection
+    
+    def _apply_schema(self, df: pd.DataFrame) -> Dict[str, int]:
+        """Cast standard fields to DEAL_DTYPES in place and count rejected values"""
+        parse_errors = {}
+        for field, dtype in DEAL_DTYPES.items():
+            if field not in df.columns:
+                continue
+            
+            values = df[field]
+            if dtype == 'category':
+                if not isinstance(values.dtype, pd.CategoricalDtype):
+                    df[field] = values.astype('category')
+                continue
+            
+            if not pd.api.types.is_numeric_dtype(values):
+                # Accept money and percentage text such as "$1,200.50" or "15%"
+                cleaned = values.astype(str).str.replace(r'[\s$,%]', '', regex=True)
+                numbers = pd.to_numeric(cleaned, errors='coerce')
+                bad_count = int((numbers.isna() & ~blank_mask(values)).sum())
+                if bad_count:
+                    parse_errors[field] = bad_count
+                values = numbers
+            df[field] = values.astype(dtype)
+        
+        return parse_errors
+    
+    def _parse_date_fields(self, df: pd.DataFrame, date_formats: Dict[str, Optional[str]]) -> Dict[str, int]:
+        """Convert date fields to datetime64 in place and count unparseable values.
+        
+        The format inferred for each field is stored in ``date_formats`` so
+        later chunks of the same file reuse it instead of guessing again.
+        """
+        parse_errors = {}
+        for field in DATE_FIELDS:
+            values = df[field]
+            if field not in date_formats:
+                date_formats[field] = infer_date_format(values)
+            
+            parsed = parse_date_column(values, date_formats[field])
+            bad_count = int((parsed.isna() & ~blank_mask(values)).sum())
+            if bad_count:
+                parse_errors[field] = bad_count
+            df[field] = parsed
+        
+        return parse_errors
+    
+    def _normalize_frame(self, df: pd.DataFrame, row_offset: int = 0, plan: Optional[ColumnPlan] = None) -> pd.DataFrame:
+        """Normalize column names and fill missing standard fields"""
+        if plan is None:
+            df.columns = self.schema_resolver.resolve(list(df.columns)).columns
+        else:
+            # The frame may hold only the projected subset of the planned header
+            df.columns = [plan.rename.get(col, col) for col in df.columns]
         
         # Add missing standard fields with defaults
         for field, default in STANDARD_FIELDS.items():
             if field not in df.columns:
                 if callable(default):
-                    df[field] = [default(i) for i in range(len(df))]
+                    df[field] = [default(i) for i in range(row_offset, row_offset + len(df))]
                 else:
                     df[field] = default
         
-        return df.to_dict('records')
+        return df
     
-    def _parse_txt(self, file_path: str) -> List[Dict[str, Any]]:
+    def _parse_txt(self, file_path: str, opener: Optional[Opener] = None) -> DealDataset:
         """Parse text file - assumes structured format or CSV-like"""
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Try to detect if it's CSV-like
-        lines = content.strip().split('\n')
-        if len(lines) > 1 and (',' in lines[0] or '\t' in lines[0]):
-            # Treat as CSV
-            delimiter = ',' if ',' in lines[0] else '\t'
-            
-            # Write to temp CSV and parse
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as tmp:
-                tmp.write(content.replace('\t', ',') if delimiter == '\t' else content)
-                tmp_path = tmp.name
-            
-            try:
-                result = self._parse_csv(tmp_path)
-                os.unlink(tmp_path)
-                return result
-            except:
-                os.unlink(tmp_path)
-                raise
+        if opener is None:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                sample = f.read(TXT_SNIFF_BYTES)
+        else:
+            with opener() as stream:
+                sample = stream.read(TXT_SNIFF_BYTES).decode('utf-8', errors='ignore')
+        
+        # Try to detect if it's CSV-like from a small sample, then let the
+        # CSV reader stream the original file with that separator
+        lines = sample.strip().splitlines()
+        if len(lines) > 1:
+            delimiter = self._sniff_delimiter(sample, lines[0])
+            if delimiter:
+                return self._parse_csv(file_path, sep=delimiter, opener=opener)
         
         # TODO: Implement more sophisticated text parsing
         # For now, create a single dummy record
-        return [{
+        return self._build_dataset(pd.DataFrame([{
             'deal_id': 'TXT_001',
             'customer_name': 'From Text File',
             'deal_size': 10000,
@@ -103,9 +375,256 @@ class DataParser:
             'close_date': '',
             'renewal': '',
             'deal_status': 'Imported from Text'
-        }]
+        }]), generated_ids=True)
+    
+    def _sniff_delimiter(self, sample: str, header: str) -> Optional[str]:
+        """Detect the field separator of a delimited text sample"""
+        try:
+            return csv.Sniffer().sniff(sample, delimiters=TXT_DELIMITERS).delimiter
+        except csv.Error:
+            # Sniffer needs consistent rows; fall back to the header line
+            counts = {delim: header.count(delim) for delim in TXT_DELIMITERS}
+            delimiter = max(counts, key=counts.get)
+            return delimiter if counts[delimiter] else None
+    
+    def iter_pdf_tables(self, file_path: str) -> Iterator[DealDataset]:
+        """Stream deal tables out of a PDF one page at a time.
+        
+        Each table's header row is resolved onto the standard fields like a
+        CSV header; tables that carry no deal columns are skipped. A table
+        whose first row is not a header but that is as wide as the last deal
+        table is taken as that table continued onto a new page, so all of
+        its rows are data. Pages are closed as soon as their tables are read
+        so memory stays flat. pdfplumber finds tables by their ruling, so
+        pages whose raw content stream draws no lines or rectangles are
+        skipped without laying out their text, which is most of the cost.
+        """
+        row_offset = 0
+        date_formats = {}
+        last_header = last_plan = None
+        ruled = _ruled_pages(file_path)
+        with pdfplumber.open(file_path) as pdf:
+            for page_number, page in enumerate(pdf.pages):
+                try:
+                    if ruled is None or page_number >= len(ruled) or ruled[page_number]:
+                        tables = page.extract_tables()
+                    else:
+                        tables = []
+                finally:
+                    page.close()
+                
+                for table in tables:
+                    if not table:
+                        continue
+                    header = self._table_header(table[0])
+                    plan = self.schema_resolver.resolve(header)
+                    if DEAL_KEY_FIELDS.intersection(plan.columns):
+                        rows = table[1:]
+                        last_header, last_plan = header, plan
+                    elif last_header is not None and len(header) == len(last_header):
+                        rows, header, plan = table, last_header, last_plan
+                    else:
+                        continue
+                    if not rows:
+                        continue
+                    
+                    df = pd.DataFrame(rows, columns=header)
+                    usecols = self._usecols(plan)
+                    if usecols is not None:
+                        df = df[usecols]
+                    yield self._build_dataset(df, row_offset, date_formats, plan)
+                    row_offset += len(df)
+    
+    def _parse_excel(self, file_path: str) -> DealDataset:
+        """Parse an Excel workbook, reading its sheets concurrently"""
+        if not EXCEL_AVAILABLE:
+            raise Exception("Excel parsing requires openpyxl. Install with: pip install openpyxl")
+        
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet_names = workbook.sheetnames
+        finally:
+            workbook.close()
+        
+        workers = min(self.sheet_workers, len(sheet_names))
+        if workers <= 1:
+            sheets = [self._parse_sheet(file_path, name) for name in sheet_names]
+        else:
+            options = {'use_cache': False, 'keep_extra_columns': self.keep_extra_columns,
+                       'pdf_workers': 1, 'sheet_workers': 1, 'chunk_size': self.chunk_size}
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                sheets = list(pool.map(_parse_sheet_in_worker, [file_path] * len(sheet_names), sheet_names,
+                                       [options] * len(sheet_names)))
+        
+        datasets = [sheet for sheet in sheets if sheet is not None]
+        if not datasets:
+            # No sheet looks like deal data; read the first one as-is, like a CSV
+            datasets = [self._parse_sheet(file_path, sheet_names[0], require_key_fields=False)]
+        
+        return self._concat_parts(datasets)
+    
+    def _concat_parts(self, datasets: List[DealDataset]) -> DealDataset:
+        """Combine the parts of one file (sheets, archive members) into a dataset.
+        
+        Each part numbers its generated deal IDs from zero, so they are
+        renumbered to stay unique across the whole file.
+        """
+        row_offset = 0
+        for dataset in datasets:
+            if dataset.generated_ids and row_offset:
+                make_id = STANDARD_FIELDS['deal_id']
+                dataset.frame['deal_id'] = [make_id(i) for i in range(row_offset, row_offset + len(dataset))]
+            row_offset += len(dataset)
+        
+        return DealDataset.concat(datasets)
+    
+    def _parse_sheet(self, file_path: str, sheet_name: str, require_key_fields: bool = True) -> Optional[DealDataset]:
+        """Parse one worksheet, or return None if it holds no deal columns"""
+        batches = list(self.stream_excel(file_path, sheet_name, self.chunk_size or CSV_CHUNK_SIZE,
+                                         require_key_fields=require_key_fields))
+        if not batches:
+            return None
+        return DealDataset.concat(batches)
+    
+    def stream_excel(self, file_path: str, sheet_name: Optional[str] = None, chunk_size: int = CSV_CHUNK_SIZE,
+                     require_key_fields: bool = False) -> Iterator[DealDataset]:
+        """Stream a worksheet as batches of normalized deals.
+        
+        The workbook is opened read-only so rows are decoded lazily; at most
+        ``chunk_size`` raw rows are held before they are typed into a batch.
+        The first non-empty row is the header. With ``require_key_fields``,
+        sheets whose header has no deal columns yield nothing.
+        """
+        if not EXCEL_AVAILABLE:
+            raise Exception("Excel parsing requires openpyxl. Install with: pip install openpyxl")
+        
+        workbook = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+            rows = sheet.iter_rows(values_only=True)
+            
+            header = None
+            for row in rows:
+                if any(cell is not None for cell in row):
+                    header = self._table_header(list(row))
+                    break
+            if header is None:
+                return
+            
+            plan = self.schema_resolver.resolve(header)
+            if require_key_fields and not DEAL_KEY_FIELDS.intersection(plan.columns):
+                return
+            
+            usecols = self._usecols(plan)
+            width = len(header)
+            row_offset = 0
+            date_formats = {}
+            batch = []
+            for row in rows:
+                if all(cell is None for cell in row):
+                    continue
+                row = tuple(row[:width])
+                batch.append(row + (None,) * (width - len(row)))
+                if len(batch) >= chunk_size:
+                    yield self._sheet_batch(batch, header, usecols, row_offset, date_formats, plan)
+                    row_offset += len(batch)
+                    batch = []
+            if batch:
+                yield self._sheet_batch(batch, header, usecols, row_offset, date_formats, plan)
+        finally:
+            workbook.close()
+    
+    def _sheet_batch(self, rows: List[tuple], header: List[str], usecols: Optional[List[str]], row_offset: int,
+                     date_formats: Dict[str, Optional[str]], plan: ColumnPlan) -> DealDataset:
+        """Type a batch of worksheet rows into a dataset"""
+        df = pd.DataFrame.from_records(rows, columns=header)
+        if usecols is not None:
+            df = df[usecols]
+        return self._build_dataset(df, row_offset, date_formats, plan)
+    
+    def _table_header(self, cells: List[Optional[str]]) -> List[str]:
+        """Clean a PDF table header row into unique column names"""
+        header = []
+        for i, cell in enumerate(cells):
+            name = ' '.join(str(cell or '').split()) or f'column_{i}'
+            while name in header:
+                name += '_'
+            header.append(name)
+        return header
+    
+    def _extract_pdf_pages(self, file_path: str) -> List[str]:
+        """Extract page texts in order, stopping once enough amounts are found.
+        
+        Only the first MAX_PDF_AMOUNTS amounts are ever used, so pages after
+        the one that completes that count are never read. The first page
+        range is read serially, since most documents complete the count
+        there; only longer documents that do not hand their remaining
+        ranges to a process pool, which is shut down as soon as the count
+        is reached.
+        """
+        if not PYPDF2_AVAILABLE:
+            return self._extract_pdfplumber_pages(file_path)
+        
+        with open(file_path, 'rb') as f:
+            page_count = len(PyPDF2.PdfReader(f).pages)
+        
+        ranges = [(start, min(start + PDF_PAGES_PER_TASK, page_count))
+                  for start in range(0, page_count, PDF_PAGES_PER_TASK)]
+        page_texts = []
+        amounts_found = 0
+        
+        def take(texts):
+            nonlocal amounts_found
+            for text in texts:
+                page_texts.append(text)
+                amounts_found += len(PDF_AMOUNT_PATTERN.findall(text))
+                if amounts_found >= MAX_PDF_AMOUNTS:
+                    return True
+            return False
+        
+        if not ranges or take(_extract_page_range(file_path, *ranges[0])):
+            return page_texts
+        
+        remaining = ranges[1:]
+        if self.pdf_workers <= 1 or page_count < PDF_PARALLEL_MIN_PAGES:
+            for start, stop in remaining:
+                if take(_extract_page_range(file_path, start, stop)):
+                    break
+            return page_texts
+        
+        pool = ProcessPoolExecutor(max_workers=min(self.pdf_workers, len(remaining)))
+        futures = []
+        try:
+            futures = [pool.submit(_extract_page_range, file_path, start, stop) for start, stop in remaining]
+            # Consume ranges in page order so the early stop matches a serial read
+            for future in futures:
+                if take(future.result()):
+                    break
+        finally:
+            # Drop ranges not yet started instead of waiting for them
+            for future in futures:
+                future.cancel()
+            pool.shutdown()
+        
+        return page_texts
+    
+    def _extract_pdfplumber_pages(self, file_path: str) -> List[str]:
+        """Serial pdfplumber text extraction with the same early stop"""
+        page_texts = []
+        amounts_found = 0
+        with pdfplumber.open(file_path) as pdf:
+            for page in pdf.pages:
+                try:
+                    text = page.extract_text() or ''
+                finally:
+                    page.close()
+                page_texts.append(text)
+                amounts_found += len(PDF_AMOUNT_PATTERN.findall(text))
+                if amounts_found >= MAX_PDF_AMOUNTS:
+                    break
+        return page_texts
     
-    def _parse_pdf(self, file_path: str) -> List[Dict[str, Any]]:
+    def _parse_pdf(self, file_path: str) -> DealDataset:
         """Parse PDF file - extract text and look for deal data"""
         if not PDF_AVAILABLE:
             raise Exception("PDF parsing requires PyPDF2 or pdfplumber. Install with: pip install PyPDF2")
@@ -113,24 +632,19 @@ class DataParser:
         text_content = ""
         
         try:
-            # Try PyPDF2 first
-            if 'PyPDF2' in sys.modules:
-                with open(file_path, 'rb') as f:
-                    reader = PyPDF2.PdfReader(f)
-                    for page in reader.pages:
-                        text_content += page.extract_text() + "\n"
+            # Prefer real deal tables when pdfplumber finds them
+            if PDFPLUMBER_AVAILABLE:
+                tables = list(self.iter_pdf_tables(file_path))
+                if tables:
+                    return DealDataset.concat(tables)
             
-            # TODO: Add pdfplumber support for better table extraction
-            # elif 'pdfplumber' in sys.modules:
-            #     with pdfplumber.open(file_path) as pdf:
-            #         for page in pdf.pages:
-            #             text_content += page.extract_text() + "\n"
+            text_content = "\n".join(self._extract_pdf_pages(file_path)) + "\n"
             
         except Exception as e:
             raise Exception(f"Error reading PDF: {str(e)}")
         
         # Basic text parsing - look for numbers that might be deal values
-        amounts = re.findall(r'\$?(\d{1,3}(?:,\d{3})*(?:\.\d{2})?)', text_content)
+        amounts = PDF_AMOUNT_PATTERN.findall(text_content)
         
         # Create dummy deal records from PDF
         deals = []
@@ -159,4 +673,5 @@ class DataParser:
                 'deal_status': 'PDF Content'
             })
         
-        return deals
\ No newline at end of file
+        # PDF deal IDs are positional placeholders, not real identifiers
+        return self._build_dataset(pd.DataFrame(deals), generated_ids=True)
\ No newline at end of file
@@ -0,0 +1,331 @@
+"""
+Deal dataset module for Revenue Watchdog
+Columnar container passed between the parser, the analyzer and the GUI
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from typing import Dict, List, Any, Iterable, Iterator, Optional, Tuple, Union
+
+from config import STANDARD_FIELDS
+
+# Column recording which file each deal in a session dataset came from
+SOURCE_FIELD = 'source_file'
+
+
+def normalize_deal_id(deal_id: Any) -> Optional[str]:
+    """A deal ID as text, so 42, 42.0 and "42" agree; None when it is missing or blank"""
+    if deal_id is None or (not isinstance(deal_id, str) and pd.isna(deal_id)):
+        return None
+    if isinstance(deal_id, (float, np.floating)) and float(deal_id).is_integer():
+        deal_id = int(deal_id)
+    return str(deal_id).strip() or None
+
+
+def _normalize_deal_ids(values: pd.Series) -> List[Optional[str]]:
+    """``normalize_deal_id`` over a whole column"""
+    missing = values.isna()
+    if pd.api.types.is_float_dtype(values):
+        if not (values[~missing] % 1 == 0).all():
+            return [normalize_deal_id(deal_id) for deal_id in values.tolist()]
+        # A numeric ID column turns float as soon as one ID is missing
+        values = values.astype('Int64')
+    texts = values.astype(str)
+    if not pd.api.types.is_numeric_dtype(values):
+        texts = texts.str.strip()
+    texts = texts.astype(object)
+    texts[missing | texts.eq('')] = None
+    return texts.tolist()
+
+
+def _align_categories(frames: List[pd.DataFrame]) -> List[pd.DataFrame]:
+    """Give shared categorical columns one set of categories so concat keeps them categorical"""
+    shared = set(frames[0].columns).intersection(*(frame.columns for frame in frames[1:]))
+    categorical = [
+        col for col in frames[0].columns
+        if col in shared and all(isinstance(frame[col].dtype, pd.CategoricalDtype) for frame in frames)
+    ]
+    if not categorical:
+        return frames
+
+    aligned = [frame.copy(deep=False) for frame in frames]
+    for col in categorical:
+        categories = union_categoricals([frame[col] for frame in frames]).categories
+        for frame in aligned:
+            frame[col] = frame[col].cat.set_categories(categories)
+    return aligned
+
+
+class DealDataset:
+    """Columnar deal table backed by a pandas DataFrame.
+
+    Deals are kept as typed columns instead of one dict per row, so large
+    books cost a handful of arrays. Record dicts are only built on demand
+    for display, prompts and legacy callers.
+    """
+
+    def __init__(self, frame: Optional[pd.DataFrame] = None, parse_errors: Optional[Dict[str, int]] = None,
+                 generated_ids: bool = False):
+        if frame is None:
+            frame = pd.DataFrame(columns=list(STANDARD_FIELDS))
+        self.frame = frame
+        # Count of values per field that could not be parsed at ingestion
+        self.parse_errors = dict(parse_errors or {})
+        # True when deal_id was filled in by the parser rather than read from the source
+        self.generated_ids = generated_ids
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> 'DealDataset':
+        """Build a dataset from a list of deal dicts"""
+        if not records:
+            return cls()
+        return cls(pd.DataFrame.from_records(records))
+
+    @classmethod
+    def coerce(cls, data: Union['DealDataset', 'IncrementalDealDataset', pd.DataFrame, List[Dict[str, Any]], None]) -> 'DealDataset':
+        """Wrap a DataFrame or list of records, passing datasets through"""
+        if isinstance(data, cls):
+            return data
+        if isinstance(data, IncrementalDealDataset):
+            return data.snapshot()
+        if isinstance(data, pd.DataFrame):
+            return cls(data)
+        return cls.from_records(list(data or []))
+
+    @classmethod
+    def concat(cls, datasets: Iterable['DealDataset']) -> 'DealDataset':
+        """Concatenate several datasets into one"""
+        datasets = list(datasets)
+        parse_errors = {}
+        for ds in datasets:
+            for field, count in ds.parse_errors.items():
+                parse_errors[field] = parse_errors.get(field, 0) + count
+        generated_ids = any(ds.generated_ids for ds in datasets)
+        
+        frames = [ds.frame for ds in datasets if len(ds)]
+        if not frames:
+            return cls(parse_errors=parse_errors, generated_ids=generated_ids)
+        if len(frames) == 1:
+            return cls(frames[0], parse_errors, generated_ids)
+        frame = pd.concat(_align_categories(frames), ignore_index=True, sort=False)
+        return cls(frame, parse_errors, generated_ids)
+
+    def __len__(self) -> int:
+        return len(self.frame)
+
+    def __bool__(self) -> bool:
+        return len(self.frame) > 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.to_records())
+
+    @property
+    def error_count(self) -> int:
+        """Total number of values rejected at ingestion"""
+        return sum(self.parse_errors.values())
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names present in the dataset"""
+        return [str(col) for col in self.frame.columns]
+
+    def column(self, name: str, default: Any = None) -> pd.Series:
+        """Return a column, or a constant series if it is missing"""
+        if name in self.frame.columns:
+            return self.frame[name]
+        return pd.Series(default, index=self.frame.index)
+
+    def head(self, n: int = 5) -> List[Dict[str, Any]]:
+        """Return the first ``n`` deals as records"""
+        return self.frame.head(n).to_dict('records')
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Materialize every deal as a dict"""
+        return self.frame.to_dict('records')
+
+
+class IncrementalDealDataset:
+    """Session dataset that grows one parsed file at a time.
+
+    Each file is kept as its own chunk and a hash index maps every deal key
+    to its current (chunk, row). Keys are deal IDs normalized to text;
+    parser-generated IDs are paired with their source file, and a deal
+    without an ID is keyed by its file and row. Appending a file upserts
+    its deals: a deal seen before is retired from its old chunk, so the
+    same deal exported twice is counted once. Appending a source that was loaded before first
+    retires every deal it contributed, so deals dropped from a re-export
+    are dropped from the session too. Appending costs time in proportion
+    to the new file and the source's earlier versions; the combined table
+    is only built when ``snapshot`` is called. Each append also logs the
+    keys it touched, so ``keys_since`` can tell an analysis which earlier
+    findings went stale.
+    """
+
+    def __init__(self):
+        self._chunks = []
+        self._live = []
+        self._chunk_sources = []
+        self._chunk_keys = []
+        self._touched = []
+        self._generated_sources = set()
+        self._index = {}
+        self._live_count = 0
+        self._snapshot = None
+        self.parse_errors = {}
+        self.sources = []
+
+    def append(self, dataset: DealDataset, source: str) -> Tuple[int, int, int]:
+        """Upsert a parsed file's deals; returns (new deals, replaced deals, deals the source no longer has)"""
+        frame = dataset.frame.copy(deep=False)
+        frame[SOURCE_FIELD] = pd.Categorical([source] * len(frame))
+
+        # Parser-generated IDs restart at DEAL_0000 in every file, so they
+        # only identify a deal within their own source
+        if dataset.generated_ids or 'deal_id' not in frame.columns:
+            self._generated_sources.add(source)
+        else:
+            self._generated_sources.discard(source)
+        if 'deal_id' in frame.columns:
+            deal_ids = _normalize_deal_ids(frame['deal_id'])
+        else:
+            deal_ids = [None] * len(frame)
+        keys = [self._key(deal_id, source, row) for row, deal_id in enumerate(deal_ids)]
+
+        reloaded = source in self.sources
+        retired = self._retire_source(source) if reloaded else set()
+
+        chunk_no = len(self._chunks)
+        live = np.ones(len(frame), dtype=bool)
+        self._chunks.append(frame)
+        self._live.append(live)
+        self._chunk_sources.append(source)
+        self._chunk_keys.append(keys)
+        # Findings for a reloaded source's deals without an ID cannot be told apart, so all of them go stale
+        self._touched.append((keys, retired | {(source, None)} if reloaded else set()))
+
+        added = replaced = 0
+        for row, key in enumerate(keys):
+            previous = self._index.get(key)
+            if key in retired:
+                # Still in the new version of its file
+                retired.discard(key)
+                replaced += 1
+                self._live_count += 1
+            elif previous is None:
+                added += 1
+                self._live_count += 1
+            else:
+                prev_chunk, prev_row = previous
+                self._live[prev_chunk][prev_row] = False
+                replaced += 1
+            self._index[key] = (chunk_no, row)
+
+        # Whatever is left was dropped from the file since it was last loaded
+        for key in retired:
+            del self._index[key]
+        for field, count in dataset.parse_errors.items():
+            self.parse_errors[field] = self.parse_errors.get(field, 0) + count
+        if source not in self.sources:
+            self.sources.append(source)
+        self._snapshot = None
+        return added, replaced, len(retired)
+
+    def _retire_source(self, source: str) -> set:
+        """Take every live deal loaded from ``source`` out of the session; returns their keys"""
+        retired = set()
+        for chunk_no, chunk_source in enumerate(self._chunk_sources):
+            if chunk_source != source:
+                continue
+            live = self._live[chunk_no]
+            for row in np.flatnonzero(live):
+                retired.add(self._chunk_keys[chunk_no][row])
+            live[:] = False
+        self._live_count -= len(retired)
+        return retired
+
+    def deal_key(self, deal_id: Any, source: Optional[str] = None) -> Any:
+        """The key of a deal, as ``append`` builds it from its ID and source file.
+
+        A deal without an ID maps to ``(source, None)``, which ``keys_since``
+        reports once that source is loaded again.
+        """
+        return self._key(normalize_deal_id(deal_id), source)
+
+    def _key(self, deal_id: Optional[str], source: Optional[str], row: Optional[int] = None) -> Any:
+        if deal_id is None:
+            return (source, row)
+        if source in self._generated_sources:
+            return (source, deal_id)
+        return deal_id
+
+    def clear(self):
+        """Drop every loaded deal"""
+        self.__init__()
+
+    @property
+    def chunk_count(self) -> int:
+        """Number of files appended so far; pass it to ``since`` later to get what the next files changed"""
+        return len(self._chunks)
+
+    def since(self, chunk_no: int) -> DealDataset:
+        """Live deals from the files appended after the first ``chunk_no``: those they added or replaced"""
+        frames = [
+            chunk[live]
+            for chunk, live in zip(self._chunks[chunk_no:], self._live[chunk_no:])
+            if live.any()
+        ]
+        return DealDataset.concat(DealDataset(frame) for frame in frames)
+
+    def keys_since(self, chunk_no: int) -> set:
+        """Keys of every deal added, replaced or removed by the files appended after the first ``chunk_no``"""
+        touched = set()
+        for keys, retired in self._touched[chunk_no:]:
+            touched.update(keys)
+            touched.update(retired)
+        return touched
+
+    def snapshot(self) -> DealDataset:
+        """Return the live deals as one dataset, rebuilt only after changes"""
+        if self._snapshot is None:
+            frames = [
+                chunk if live.all() else chunk[live]
+                for chunk, live in zip(self._chunks, self._live)
+                if live.any()
+            ]
+            datasets = [DealDataset(frame) for frame in frames]
+            self._snapshot = DealDataset.concat(datasets)
+            self._snapshot.parse_errors = dict(self.parse_errors)
+        return self._snapshot
+
+    def __len__(self) -> int:
+        return self._live_count
+
+    def __bool__(self) -> bool:
+        return self._live_count > 0
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self.snapshot())
+
+    @property
+    def error_count(self) -> int:
+        """Total number of values rejected at ingestion"""
+        return sum(self.parse_errors.values())
+
+    @property
+    def columns(self) -> List[str]:
+        """Column names present in any loaded file"""
+        return list(dict.fromkeys(str(col) for chunk in self._chunks for col in chunk.columns))
+
+    def head(self, n: int = 5) -> List[Dict[str, Any]]:
+        """Return the first ``n`` live deals as records"""
+        records = []
+        for chunk, live in zip(self._chunks, self._live):
+            if len(records) >= n:
+                break
+            records.extend(chunk[live].head(n - len(records)).to_dict('records'))
+        return records
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Materialize every live deal as a dict"""
+        return self.snapshot().to_records()
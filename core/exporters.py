@@ -0,0 +1,87 @@
+"""
+Export module for Revenue Watchdog
+Writes analysis results as CSV, Excel or JSON reports, shared by the GUI and the CLI
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import DATETIME_FORMAT, EXPORT_COMMENT_PREFIX
+from utils.helpers import format_currency
+
+EXPORT_FORMATS = ['.csv', '.xlsx', '.json']
+
+
+def export_csv(file_path: str, flagged_deals: List[Dict[str, Any]], summary: Dict[str, Any]):
+    """Export to CSV format"""
+    import pandas as pd
+
+    df = pd.DataFrame(flagged_deals)
+
+    with open(file_path, 'w', newline='', encoding='utf-8') as f:
+        f.write(f"{EXPORT_COMMENT_PREFIX} Revenue Leakage Analysis Report\n")
+        f.write(f"{EXPORT_COMMENT_PREFIX} Generated: {datetime.now().strftime(DATETIME_FORMAT)}\n")
+        f.write(f"{EXPORT_COMMENT_PREFIX} Total Leakage: {format_currency(summary.get('total_leakage', 0))}\n")
+        f.write(f"{EXPORT_COMMENT_PREFIX} High Risk Deals: {summary.get('high_risk_deals', 0)}\n")
+        f.write(f"{EXPORT_COMMENT_PREFIX}\n")
+
+        df.to_csv(f, index=False)
+
+
+def export_excel(file_path: str, flagged_deals: List[Dict[str, Any]], summary: Dict[str, Any], total_deals: int):
+    """Export to Excel format with multiple sheets"""
+    import pandas as pd
+
+    with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
+        # Flagged deals sheet
+        df_deals = pd.DataFrame(flagged_deals)
+        df_deals.to_excel(writer, sheet_name='Flagged Deals', index=False)
+
+        # Summary sheet
+        summary_data = {
+            'Metric': ['Total Leakage', 'High Risk Deals', 'Issues Found', 'Total Deals Analyzed'],
+            'Value': [summary.get('total_leakage', 0),
+                     summary.get('high_risk_deals', 0),
+                     summary.get('issues_found', 0),
+                     total_deals]
+        }
+        df_summary = pd.DataFrame(summary_data)
+        df_summary.to_excel(writer, sheet_name='Summary', index=False)
+
+
+def export_json(file_path: str, analysis_results: Dict[str, Any], total_deals: int,
+                profile: Optional[List[Dict[str, Any]]] = None):
+    """Export to JSON format, with per-stage timings in the metadata when given"""
+    # Add metadata
+    export_data = {
+        'metadata': {
+            'generated': datetime.now().strftime(DATETIME_FORMAT),
+            'total_deals_analyzed': total_deals,
+            'export_version': '1.0'
+        },
+        'analysis_results': analysis_results
+    }
+    if profile is not None:
+        export_data['metadata']['performance'] = profile
+
+    with open(file_path, 'w', encoding='utf-8') as f:
+        json.dump(export_data, f, indent=2, default=str)
+
+
+def export_results(file_path: str, analysis_results: Dict[str, Any], total_deals: int,
+                   profile: Optional[List[Dict[str, Any]]] = None):
+    """Write a report in the format given by the file extension"""
+    flagged_deals = analysis_results.get('flagged_deals', [])
+    summary = analysis_results.get('summary', {})
+
+    file_ext = Path(file_path).suffix.lower()
+    if file_ext == '.csv':
+        export_csv(file_path, flagged_deals, summary)
+    elif file_ext == '.xlsx':
+        export_excel(file_path, flagged_deals, summary, total_deals)
+    elif file_ext == '.json':
+        export_json(file_path, analysis_results, total_deals, profile)
+    else:
+        raise ValueError(f"Unsupported export format: {file_ext}")
@@ -0,0 +1,160 @@
+"""
+Pooled HTTP sessions for Revenue Watchdog
+Keeps connections to the LLM API open between requests and times how long
+connecting and waiting for the first response byte take
+"""
+
+import socket
+import threading
+import time
+from typing import Any, Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import PoolManager
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+from config import LLM_KEEPALIVE_IDLE, LLM_KEEPALIVE_INTERVAL, LLM_KEEPALIVE_PROBES
+
+
+def keepalive_socket_options() -> list:
+    """Socket options that turn on TCP keep-alive, with the probe timings where the OS supports them"""
+    options = list(HTTPConnection.default_socket_options)
+    options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+    for name, value in (('TCP_KEEPIDLE', LLM_KEEPALIVE_IDLE),
+                        ('TCP_KEEPALIVE', LLM_KEEPALIVE_IDLE),  # macOS name for TCP_KEEPIDLE
+                        ('TCP_KEEPINTVL', LLM_KEEPALIVE_INTERVAL),
+                        ('TCP_KEEPCNT', LLM_KEEPALIVE_PROBES)):
+        if hasattr(socket, name):
+            options.append((socket.IPPROTO_TCP, getattr(socket, name), value))
+    return options
+
+
+class ConnectionTimings:
+    """Thread-safe totals of connection setup and time-to-first-byte.
+
+    ``connect`` covers DNS, TCP and TLS for each new connection; ``ttfb``
+    runs from the request being sent to the response headers arriving, on
+    every request. With keep-alive working, connections stay near the pool
+    size however many requests are made.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Start counting from zero"""
+        with self._lock:
+            self.connections = 0
+            self.connect_s = 0.0
+            self.requests = 0
+            self.ttfb_s = 0.0
+
+    def add_connect(self, seconds: float):
+        with self._lock:
+            self.connections += 1
+            self.connect_s += seconds
+
+    def add_ttfb(self, seconds: float):
+        with self._lock:
+            self.requests += 1
+            self.ttfb_s += seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Counts, totals and per-event averages in seconds"""
+        with self._lock:
+            return {
+                'connections': self.connections,
+                'requests': self.requests,
+                'connect_s': round(self.connect_s, 4),
+                'ttfb_s': round(self.ttfb_s, 4),
+                'avg_connect_s': round(self.connect_s / self.connections, 4) if self.connections else None,
+                'avg_ttfb_s': round(self.ttfb_s / self.requests, 4) if self.requests else None,
+            }
+
+
+class _TimedConnectionMixin:
+    timings = None
+
+    def connect(self):
+        start = time.perf_counter()
+        super().connect()
+        if self.timings is not None:
+            self.timings.add_connect(time.perf_counter() - start)
+
+    def getresponse(self, *args, **kwargs):
+        start = time.perf_counter()
+        response = super().getresponse(*args, **kwargs)
+        if self.timings is not None:
+            self.timings.add_ttfb(time.perf_counter() - start)
+        return response
+
+
+class TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+
+class TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+
+class _TimedPoolMixin:
+    timings = None
+
+    def _new_conn(self):
+        conn = super()._new_conn()
+        conn.timings = self.timings
+        return conn
+
+
+class TimedHTTPConnectionPool(_TimedPoolMixin, HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(_TimedPoolMixin, HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedPoolManager(PoolManager):
+    """PoolManager whose connections report to a ConnectionTimings"""
+
+    def __init__(self, timings: ConnectionTimings, **kwargs):
+        super().__init__(**kwargs)
+        self.timings = timings
+        self.pool_classes_by_scheme = {'http': TimedHTTPConnectionPool, 'https': TimedHTTPSConnectionPool}
+
+    def _new_pool(self, scheme, host, port, request_context=None):
+        pool = super()._new_pool(scheme, host, port, request_context)
+        pool.timings = self.timings
+        return pool
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter with TCP keep-alive on and connect/first-byte timing"""
+
+    def __init__(self, timings: ConnectionTimings, **kwargs):
+        self.timings = timings
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        self._pool_connections = connections
+        self._pool_maxsize = maxsize
+        self._pool_block = block
+        pool_kwargs.setdefault('socket_options', keepalive_socket_options())
+        self.poolmanager = TimedPoolManager(self.timings, num_pools=connections, maxsize=maxsize,
+                                            block=block, **pool_kwargs)
+
+
+def make_session(pool_size: int, timings: ConnectionTimings) -> requests.Session:
+    """A session that keeps up to ``pool_size`` connections per host open for reuse.
+
+    The pool blocks rather than opening extra throwaway connections when
+    more than ``pool_size`` requests run at once.
+    """
+    session = requests.Session()
+    adapter = TimedHTTPAdapter(timings, pool_connections=1, pool_maxsize=max(1, pool_size), pool_block=True)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
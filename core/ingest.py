@@ -0,0 +1,51 @@
+"""
+Ingestion module for Revenue Watchdog
+Parses many deal files concurrently across a process pool
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from config import INGEST_MAX_WORKERS
+from .data_parser import DataParser
+from .deal_dataset import DealDataset
+
+# (file path, parsed dataset or None, error or None)
+ParseResult = Tuple[str, Optional[DealDataset], Optional[Exception]]
+
+
+def _parse_in_worker(file_path: str, parser_options: Dict[str, Any]) -> DealDataset:
+    """Parse a single file inside a pool worker"""
+    # Files are already spread across cores, so don't fan out pages or sheets too
+    return DataParser(**{'pdf_workers': 1, 'sheet_workers': 1, **parser_options}).parse_file(file_path)
+
+
+def parse_files_parallel(file_paths: List[str], max_workers: Optional[int] = INGEST_MAX_WORKERS,
+                         parser_options: Optional[Dict[str, Any]] = None) -> Iterator[ParseResult]:
+    """Parse files concurrently, yielding each result as soon as it completes.
+
+    A failure in one file is yielded as that file's error and does not stop
+    the others. Single files and ``max_workers=1`` are parsed in-process.
+    ``parser_options`` are passed to each worker's DataParser.
+    """
+    parser_options = parser_options or {}
+    max_workers = min(max_workers or os.cpu_count() or 1, len(file_paths))
+
+    if max_workers <= 1:
+        parser = DataParser(**parser_options)
+        for file_path in file_paths:
+            try:
+                yield file_path, parser.parse_file(file_path), None
+            except Exception as e:
+                yield file_path, None, e
+        return
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(_parse_in_worker, file_path, parser_options): file_path for file_path in file_paths}
+        for future in as_completed(futures):
+            file_path = futures[future]
+            try:
+                yield file_path, future.result(), None
+            except Exception as e:
+                yield file_path, None, e
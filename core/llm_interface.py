@@ -3,25 +3,124 @@ LLM Interface module for Revenue Watchdog
 Handles AI-powered deal analysis and revenue leakage detection
 """
 
+import asyncio
 import json
-import requests
+import threading
+import zlib
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 import pandas as pd
+import requests
+
+from config import (DEFAULT_BASE_URL, DEFAULT_MODEL, API_TIMEOUT, LLM_MAX_TOKENS, LLM_BATCH_TOKEN_BUDGET,
+                    LLM_BATCH_MAX_DEALS, LLM_MAX_CONCURRENCY, CHARS_PER_TOKEN, PROMPT_FORMAT, PROMPT_FIELDS,
+                    PROMPT_DECIMALS, PROMPT_TEXT_MAX_CHARS, LLM_TEMPERATURE, LLM_CACHE_ENABLED,
+                    LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE, LLM_MAX_RETRIES, LLM_RETRY_MAX_WAIT)
+from utils.profiling import Profiler
+from .cache import ResponseCache
+from .deal_dataset import DealDataset, SOURCE_FIELD, normalize_deal_id
+from .http_pool import ConnectionTimings, make_session
+from .rate_limit import LLMAPIError, RateLimiter, backoff_delay, parse_retry_after
+from .rules import evaluate_rules
+
+
+# 'compact' writes deals as a header-once table of the analyzed fields;
+# 'json' writes every deal as a pretty-printed record
+PROMPT_FORMATS = ['compact', 'json']
+COMPACT_SEPARATOR = '|'
+
+# Statuses worth retrying: rate limits and transient server trouble
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate the token count of a prompt fragment without a tokenizer"""
+    return len(text) // CHARS_PER_TOKEN + 1
+
+
+def _as_number(value: Any) -> float:
+    """Read a summary figure from a model reply, treating anything unreadable as 0"""
+    try:
+        return float(str(value).replace('$', '').replace(',', ''))
+    except ValueError:
+        return 0
 
-from config import DEFAULT_BASE_URL, DEFAULT_MODEL, API_TIMEOUT, HIGH_DISCOUNT_THRESHOLD, OPPORTUNITY_COST_FACTOR
-from utils.helpers import is_date_past
+
+def _is_analysis(result: Any) -> bool:
+    """Whether a parsed reply has the shape the prompt asks for, so it can be cached and merged"""
+    if not isinstance(result, dict) or not isinstance(result.get('flagged_deals'), list):
+        return False
+    if not all(isinstance(deal, dict) for deal in result['flagged_deals']):
+        return False
+    return (isinstance(result.get('summary', {}), dict)
+            and isinstance(result.get('recommendations', []), list))
+
+
+def _compact_column(values: pd.Series, field: str) -> pd.Series:
+    """Render one column as short strings: rounded numbers, plain dates, truncated text"""
+    missing = values.isna()
+    if pd.api.types.is_datetime64_any_dtype(values):
+        text = values.dt.strftime('%Y-%m-%d')
+    elif pd.api.types.is_numeric_dtype(values):
+        decimals = PROMPT_DECIMALS.get(field, 2)
+        text = values.round(decimals).astype(str).str.replace(r'\.0+$', '', regex=True)
+    else:
+        text = values.astype(object).where(~missing, '').astype(str)
+        text = text.str.replace(r'[|\s]+', ' ', regex=True).str.strip().str.slice(0, PROMPT_TEXT_MAX_CHARS)
+    return text.where(~missing, '')
 
 
 class LLMInterface:
     """Handles LLM API calls for deal analysis"""
     
-    def __init__(self, api_key: str = "", base_url: str = DEFAULT_BASE_URL):
+    def __init__(self, api_key: str = "", base_url: str = DEFAULT_BASE_URL,
+                 max_concurrency: int = LLM_MAX_CONCURRENCY, batch_token_budget: int = LLM_BATCH_TOKEN_BUDGET,
+                 prompt_format: str = PROMPT_FORMAT, use_cache: bool = LLM_CACHE_ENABLED,
+                 requests_per_minute: float = LLM_REQUESTS_PER_MINUTE,
+                 tokens_per_minute: float = LLM_TOKENS_PER_MINUTE):
+        if prompt_format not in PROMPT_FORMATS:
+            raise ValueError(f"Unknown prompt format: {prompt_format}")
         self.api_key = api_key
         self.base_url = base_url
         self.model = DEFAULT_MODEL
+        self.temperature = LLM_TEMPERATURE
+        self.max_tokens = LLM_MAX_TOKENS
+        self.max_concurrency = max_concurrency
+        self.batch_token_budget = batch_token_budget
+        self.batch_max_deals = LLM_BATCH_MAX_DEALS
+        self.prompt_format = prompt_format
+        self.cache = self._open_cache() if use_cache else None
+        self.max_retries = LLM_MAX_RETRIES
+        self.rate_limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.timings = ConnectionTimings()
+        self._session = None
+        self._session_lock = threading.Lock()
+    
+    @property
+    def session(self):
+        """Pooled HTTP session, opened on first use and kept for later analyses"""
+        with self._session_lock:
+            if self._session is None:
+                self._session = make_session(self.max_concurrency, self.timings)
+            return self._session
+    
+    def close(self):
+        """Close pooled connections; a later request opens a new session"""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+    
+    def _open_cache(self) -> Optional[ResponseCache]:
+        """Open the on-disk response cache, or run uncached if it is unavailable"""
+        try:
+            return ResponseCache()
+        except OSError:
+            return None
         
-    def analyze_deals(self, parsed_data: List[Dict]) -> Dict[str, Any]:
+    def analyze_deals(self, parsed_data: Union[DealDataset, List[Dict]],
+                      profiler: Optional[Profiler] = None) -> Dict[str, Any]:
         """
         Analyze deals data using LLM for revenue leakage detection.
         
@@ -33,49 +132,324 @@ class LLMInterface:
           and a short remediation suggestion.
         
         Deals Data: {{parsed_data}}
+        
+        Large books are split into batches of at most ``batch_token_budget``
+        prompt tokens that are analyzed concurrently and merged into one
+        result. Replies are cached on disk per batch, so repeat analyses only
+        send the batches whose deals changed. Requests share a pooled
+        keep-alive session, stay within the requests- and tokens-per-minute
+        limits and are retried after rate limits and transient failures.
+        Batches that still fail are analyzed by the rule engine and listed
+        under ``errors`` in the result. ``profiler`` records the prompt,
+        cache, http, response and rules stages; the http stage also carries
+        retry counts and connect and time-to-first-byte totals.
         """
         
+        profiler = profiler or Profiler(enabled=False)
+        parsed_data = DealDataset.coerce(parsed_data)
+        
         if not self.api_key:
-            return self._mock_analysis(parsed_data)
-            
-        prompt = self._build_analysis_prompt(parsed_data)
+            return self._profiled_mock_analysis(parsed_data, profiler)
         
-        try:
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers={
-                    "Authorization": f"Bearer {self.api_key}",
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": self.model,
-                    "messages": [{"role": "user", "content": prompt}],
-                    "temperature": 0.1,
-                    "max_tokens": 2000
-                },
-                timeout=API_TIMEOUT
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                content = result['choices'][0]['message']['content']
-                
-                # Try to parse JSON from response
+        # Split the book into batches that fit the prompt budget; each batch
+        # is an independent request, sent up to max_concurrency at a time
+        with profiler.stage('prompt', rows=len(parsed_data)) as record:
+            batches = self._batch_deals(parsed_data)
+            prompts = [self._build_analysis_prompt(batch) for batch in batches]
+            record['tokens'] = sum(estimate_tokens(prompt) for prompt in prompts)
+        
+        replies = [None] * len(prompts)
+        cache_keys = [None] * len(prompts)
+        if self.cache is not None:
+            with profiler.stage('cache', rows=len(prompts)) as record:
+                cache_keys = [self.cache.key_for(self.model, self.temperature, prompt) for prompt in prompts]
+                replies = [self.cache.get(key) for key in cache_keys]
+                record['hits'] = sum(reply is not None for reply in replies)
+        
+        pending = [i for i, reply in enumerate(replies) if reply is None]
+        with profiler.stage('http', rows=len(pending)) as record:
+            self.timings.reset()
+            for i, reply in zip(pending, self._complete_all([prompts[i] for i in pending], record)):
+                replies[i] = reply
+            record.update(self.timings.to_dict())
+        
+        results = [None] * len(batches)
+        errors = []
+        with profiler.stage('response') as record:
+            for i, reply in enumerate(replies):
+                if isinstance(reply, Exception):
+                    errors.append({'batch': i + 1, 'deals': len(batches[i]), 'error': str(reply)})
+                    continue
                 try:
-                    return json.loads(content)
+                    result = json.loads(reply)
                 except json.JSONDecodeError:
-                    # Fallback if response isn't pure JSON
-                    return self._parse_llm_response(content, parsed_data)
-            else:
-                print(f"API Error: {response.status_code}")
-                return self._mock_analysis(parsed_data)
-                
-        except Exception as e:
-            print(f"LLM API Error: {str(e)}")
-            return self._mock_analysis(parsed_data)
+                    errors.append({'batch': i + 1, 'deals': len(batches[i]), 'error': "Reply was not valid JSON"})
+                    continue
+                if not _is_analysis(result):
+                    errors.append({'batch': i + 1, 'deals': len(batches[i]),
+                                   'error': "Reply was not an analysis in the requested format"})
+                    continue
+                results[i] = result
+                self._tag_sources(result, batches[i])
+                if cache_keys[i] is not None and i in pending:
+                    try:
+                        self.cache.put(cache_keys[i], reply)
+                    except OSError:
+                        pass
+            record['rows'] = sum(len(result.get('flagged_deals', [])) for result in results if result)
+        
+        # Batches without a usable reply fall back to the rule engine
+        failed = [i for i, result in enumerate(results) if result is None]
+        if failed:
+            with profiler.stage('rules', rows=sum(len(batches[i]) for i in failed)):
+                for i in failed:
+                    reply = replies[i]
+                    if isinstance(reply, Exception):
+                        results[i] = self._mock_analysis(batches[i])
+                    else:
+                        # Fallback if response isn't pure JSON
+                        results[i] = self._parse_llm_response(reply, batches[i])
+        
+        merged = self._merge_results(results)
+        if errors:
+            merged['errors'] = errors
+        return merged
     
-    def _build_analysis_prompt(self, parsed_data: List[Dict]) -> str:
+    def update_analysis(self, previous: Dict[str, Any], changed_deals: Union[DealDataset, List[Dict]],
+                        profiler: Optional[Profiler] = None, changed_keys: Optional[set] = None,
+                        key_for: Optional[Callable[[Any, Optional[str]], Any]] = None) -> Dict[str, Any]:
+        """Analyze only deals that were added or replaced and fold them into an earlier result.
+        
+        Flagged entries whose key is in ``changed_keys`` are dropped from
+        ``previous`` and their impact is taken out of its summary before the
+        new analysis is merged in, so unchanged deals are not sent again and
+        replaced or removed deals are not counted twice. ``key_for`` maps a
+        flagged deal's ID and source file to the same key, e.g.
+        ``IncrementalDealDataset.deal_key`` with its ``keys_since``; without
+        them, deals are matched by ID alone.
+        """
+        changed_deals = DealDataset.coerce(changed_deals)
+        if len(changed_deals):
+            update = self.analyze_deals(changed_deals, profiler)
+        else:
+            update = {'summary': {}, 'flagged_deals': [], 'recommendations': []}
+        
+        if key_for is None:
+            key_for = lambda deal_id, source: normalize_deal_id(deal_id)
+        if changed_keys is None:
+            changed_keys = {
+                key_for(deal_id, source) for deal_id, source in
+                zip(changed_deals.column('deal_id').tolist(), changed_deals.column(SOURCE_FIELD).tolist())
+            }
+        kept, dropped = [], []
+        for deal in previous.get('flagged_deals') or []:
+            key = key_for(deal.get('deal_id'), deal.get(SOURCE_FIELD))
+            (dropped if key in changed_keys else kept).append(deal)
+        
+        summary = previous.get('summary') or {}
+        unchanged = {
+            'summary': {
+                'total_leakage': _as_number(summary.get('total_leakage', 0))
+                                 - sum(_as_number(deal.get('impact', 0)) for deal in dropped),
+                'high_risk_deals': max(0, _as_number(summary.get('high_risk_deals', 0)) - len(dropped)),
+                'issues_found': max(0, _as_number(summary.get('issues_found', 0)) - len(dropped))
+            },
+            'flagged_deals': kept,
+            'recommendations': previous.get('recommendations') or []
+        }
+        merged = self._merge_results([unchanged, update])
+        errors = (previous.get('errors') or []) + (update.get('errors') or [])
+        if errors:
+            merged['errors'] = errors
+        return merged
+    
+    def _batch_deals(self, parsed_data: DealDataset) -> List[DealDataset]:
+        """Split deals into consecutive batches whose serialized rows fit the token budget.
+        
+        With the response cache on, a batch past half its budget also ends
+        after any deal whose text hashes to a cut point. Boundaries then
+        depend on content rather than position, so after an edited, added
+        or removed deal they fall back into step and the following batches
+        still hit the cache.
+        """
+        if len(parsed_data) <= 1:
+            return [parsed_data]
+        
+        header, rows = self._serialize_deals(parsed_data)
+        if not rows:
+            return [parsed_data]
+        row_tokens = [estimate_tokens(row) for row in rows]
+        budget = self.batch_token_budget - estimate_tokens(header)
+        # Cut points are spaced so a batch almost always finds one before it is full
+        half_batch = min(budget / 2 / (sum(row_tokens) / len(row_tokens)), self.batch_max_deals / 2)
+        cut_every = max(1, int(half_batch / 4))
+        batches = []
+        start = used = 0
+        for i, tokens in enumerate(row_tokens):
+            full = i > start and (used + tokens > budget or i - start >= self.batch_max_deals)
+            if full:
+                batches.append((start, i))
+                start, used = i, 0
+            used += tokens
+            half_full = used >= budget / 2 or i + 1 - start >= self.batch_max_deals / 2
+            if self.cache is not None and half_full and zlib.crc32(rows[i].encode('utf-8')) % cut_every == 0:
+                batches.append((start, i + 1))
+                start, used = i + 1, 0
+        if start < len(row_tokens):
+            batches.append((start, len(row_tokens)))
+        
+        frame = parsed_data.frame
+        return [DealDataset(frame.iloc[a:b], generated_ids=parsed_data.generated_ids) for a, b in batches]
+    
+    def _serialize_deals(self, parsed_data: DealDataset) -> Tuple[str, List[str]]:
+        """Serialize deals for the prompt as (header, one string per deal)"""
+        if self.prompt_format == 'json':
+            return '', [json.dumps(record, indent=2, default=str) for record in parsed_data.to_records()]
+        
+        frame = parsed_data.frame
+        # Deals that carry none of the analyzed fields are sent with every column they have
+        fields = [field for field in PROMPT_FIELDS if field in frame.columns] or list(frame.columns)
+        header = COMPACT_SEPARATOR.join(str(field) for field in fields)
+        if not fields or not len(frame):
+            return header, []
+        
+        columns = [_compact_column(frame[field], str(field)) for field in fields]
+        rows = columns[0].str.cat(columns[1:], sep=COMPACT_SEPARATOR) if len(columns) > 1 else columns[0]
+        return header, rows.tolist()
+    
+    def _format_deals(self, parsed_data: DealDataset) -> str:
+        """The deals data block of a prompt"""
+        if self.prompt_format == 'json':
+            return json.dumps(parsed_data.to_records(), indent=2, default=str)
+        header, rows = self._serialize_deals(parsed_data)
+        return '\n'.join([header] + rows)
+    
+    def tokens_per_deal(self, parsed_data: Union[DealDataset, List[Dict]]) -> float:
+        """Estimated prompt tokens each deal costs in the current prompt format"""
+        parsed_data = DealDataset.coerce(parsed_data)
+        if not len(parsed_data):
+            return 0.0
+        return estimate_tokens(self._format_deals(parsed_data)) / len(parsed_data)
+    
+    def _complete_all(self, prompts: List[str], stats: Optional[Dict[str, Any]] = None) -> List[Union[str, Exception]]:
+        """Send prompts concurrently; returns each reply's content, or the error that ended its retries"""
+        if not prompts:
+            return []
+        return asyncio.run(self.complete_all_async(prompts, stats))
+    
+    async def complete_all_async(self, prompts: List[str],
+                                 stats: Optional[Dict[str, Any]] = None) -> List[Union[str, Exception]]:
+        """Send prompts from a running event loop, at most ``max_concurrency`` in flight.
+        
+        Counts of retries and of 429 replies are added to ``stats`` when given.
+        """
+        stats = stats if stats is not None else {}
+        stats.setdefault('retries', 0)
+        stats.setdefault('rate_limited', 0)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Blocking requests run on their own threads so the default executor's size does not cap concurrency
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(prompts)))) as executor:
+            async def complete(prompt):
+                try:
+                    return await self._complete_async(prompt, semaphore, executor, stats)
+                except Exception as e:
+                    return e
+            
+            return await asyncio.gather(*(complete(prompt) for prompt in prompts))
+    
+    async def _complete_async(self, prompt: str, semaphore: asyncio.Semaphore, executor: ThreadPoolExecutor,
+                              stats: Dict[str, Any]) -> str:
+        """Send one prompt, waiting on the rate limits and retrying rate-limited or failed attempts"""
+        loop = asyncio.get_running_loop()
+        tokens = estimate_tokens(prompt)
+        for attempt in range(self.max_retries + 1):
+            await asyncio.sleep(self.rate_limiter.reserve(tokens))
+            async with semaphore:
+                try:
+                    response = await loop.run_in_executor(executor, self._post, prompt)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    error = LLMAPIError(f"API request failed: {str(e)}")
+                    delay = backoff_delay(attempt)
+                else:
+                    if response.status_code == 200:
+                        return self._reply_content(response)
+                    error = LLMAPIError(f"API Error: {response.status_code}", response.status_code)
+                    if response.status_code not in RETRY_STATUSES:
+                        raise error
+                    if response.status_code == 429:
+                        stats['rate_limited'] += 1
+                    retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                    if retry_after is None:
+                        delay = backoff_delay(attempt)
+                    elif retry_after > LLM_RETRY_MAX_WAIT:
+                        raise LLMAPIError(f"API Error: {response.status_code} (retry after {retry_after:.0f}s)",
+                                          response.status_code)
+                    else:
+                        # The limit applies to every request, so hold them all back, not just this one
+                        self.rate_limiter.defer(retry_after)
+                        delay = 0
+            if attempt == self.max_retries:
+                raise error
+            stats['retries'] += 1
+            await asyncio.sleep(delay)
+    
+    def _post(self, prompt: str) -> requests.Response:
+        """Send one prompt over the pooled session"""
+        return self.session.post(
+            f"{self.base_url}/chat/completions",
+            headers={
+                "Authorization": f"Bearer {self.api_key}",
+                "Content-Type": "application/json"
+            },
+            json={
+                "model": self.model,
+                "messages": [{"role": "user", "content": prompt}],
+                "temperature": self.temperature,
+                "max_tokens": self.max_tokens
+            },
+            timeout=API_TIMEOUT
+        )
+    
+    def _reply_content(self, response: requests.Response) -> str:
+        """The reply text of a successful completion"""
+        try:
+            return response.json()['choices'][0]['message']['content']
+        except (ValueError, KeyError, IndexError, TypeError):
+            raise LLMAPIError("API Error: unexpected response body", response.status_code)
+    
+    def _merge_results(self, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine per-batch analyses into one result"""
+        if len(results) == 1:
+            return results[0]
+        
+        summary = {'total_leakage': 0, 'high_risk_deals': 0, 'issues_found': 0}
+        flagged_deals = []
+        recommendations = {}
+        for result in results:
+            batch_summary = result.get('summary') or {}
+            for key in summary:
+                summary[key] += _as_number(batch_summary.get(key, 0))
+            flagged_deals.extend(result.get('flagged_deals') or [])
+            # Batches tend to repeat the same advice; keep the first wording of each
+            for recommendation in result.get('recommendations') or []:
+                recommendations.setdefault(str(recommendation).strip().lower(), recommendation)
+        
+        summary['high_risk_deals'] = int(summary['high_risk_deals'])
+        summary['issues_found'] = int(summary['issues_found'])
+        return {
+            'summary': summary,
+            'flagged_deals': flagged_deals,
+            'recommendations': list(recommendations.values())
+        }
+    
+    def _build_analysis_prompt(self, parsed_data: Union[DealDataset, List[Dict]]) -> str:
         """Build the analysis prompt for the LLM"""
+        deals_data = self._format_deals(DealDataset.coerce(parsed_data))
+        if self.prompt_format == 'compact':
+            data_heading = ("DEALS DATA (one deal per line, fields separated by '|', first line names the fields; "
+                            "deal_size and unit_price in dollars, discount_percent in percent, dates as YYYY-MM-DD):")
+        else:
+            data_heading = "DEALS DATA:"
         return f"""
         Analyze the following deals data for revenue leakage and margin risks:
 
@@ -84,8 +458,8 @@ class LLMInterface:
         2. For each issue found, provide: deal_id, risk_type, estimated_impact, remediation_suggestion
         3. Respond in valid JSON format only
 
-        DEALS DATA:
-        {json.dumps(parsed_data, indent=2, default=str)}
+        {data_heading}
+        {deals_data}
 
         Respond with JSON in this format:
         {{
@@ -97,39 +471,9 @@ class LLMInterface:
         }}
         """
     
-    def _mock_analysis(self, parsed_data: List[Dict]) -> Dict[str, Any]:
+    def _mock_analysis(self, parsed_data: Union[DealDataset, List[Dict]]) -> Dict[str, Any]:
         """Fallback analysis when LLM is unavailable"""
-        flagged_deals = []
-        total_leakage = 0
-        
-        for deal in parsed_data:
-            # Basic rule-based analysis
-            deal_id = deal.get('deal_id', 'Unknown')
-            deal_size = float(deal.get('deal_size', 0))
-            discount = float(deal.get('discount_percent', 0))
-            
-            # Flag high discounts
-            if discount > HIGH_DISCOUNT_THRESHOLD:
-                impact = deal_size * (discount - HIGH_DISCOUNT_THRESHOLD) / 100
-                flagged_deals.append({
-                    'deal_id': deal_id,
-                    'risk_type': 'unauthorized_discount',
-                    'impact': impact,
-                    'suggestion': f'Review {discount}% discount approval for deal {deal_id}'
-                })
-                total_leakage += impact
-            
-            # Flag expired deals still in pipeline
-            close_date = deal.get('close_date', '')
-            if close_date and is_date_past(close_date):
-                impact = deal_size * OPPORTUNITY_COST_FACTOR
-                flagged_deals.append({
-                    'deal_id': deal_id,
-                    'risk_type': 'phantom_pipeline',
-                    'impact': impact,
-                    'suggestion': f'Remove expired deal {deal_id} from pipeline'
-                })
-                total_leakage += impact
+        flagged_deals, total_leakage = evaluate_rules(DealDataset.coerce(parsed_data))
         
         return {
             'summary': {
@@ -145,7 +489,29 @@ class LLMInterface:
             ]
         }
     
-    def _parse_llm_response(self, content: str, parsed_data: List[Dict]) -> Dict[str, Any]:
+    def _tag_sources(self, result: Dict[str, Any], batch: DealDataset):
+        """Record the source file of each flagged deal whose ID is unique within its batch"""
+        flagged_deals = result.get('flagged_deals') if isinstance(result, dict) else None
+        if not flagged_deals or SOURCE_FIELD not in batch.columns:
+            return
+        
+        sources = {}
+        for deal_id, source in zip(batch.column('deal_id').tolist(), batch.column(SOURCE_FIELD).tolist()):
+            # Generated IDs repeat across files, so a shared ID cannot be traced back to one
+            deal_id = normalize_deal_id(deal_id)
+            sources[deal_id] = source if sources.get(deal_id, source) == source else None
+        for deal in flagged_deals:
+            if isinstance(deal, dict) and SOURCE_FIELD not in deal:
+                source = sources.get(normalize_deal_id(deal.get('deal_id')))
+                if source is not None:
+                    deal[SOURCE_FIELD] = source
+    
+    def _profiled_mock_analysis(self, parsed_data: DealDataset, profiler: Profiler) -> Dict[str, Any]:
+        """Run the rule-based fallback as the 'rules' stage"""
+        with profiler.stage('rules', rows=len(parsed_data)):
+            return self._mock_analysis(parsed_data)
+    
+    def _parse_llm_response(self, content: str, parsed_data: Union[DealDataset, List[Dict]]) -> Dict[str, Any]:
         """Parse non-JSON LLM responses"""
         # TODO: Implement more sophisticated parsing
         return self._mock_analysis(parsed_data)
\ No newline at end of file
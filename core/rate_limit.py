@@ -0,0 +1,95 @@
+"""
+Rate limiting for Revenue Watchdog's LLM requests
+Token buckets for requests and tokens per minute, Retry-After parsing and
+jittered exponential backoff
+"""
+
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+from config import LLM_BACKOFF_BASE, LLM_BACKOFF_MAX
+
+
+class LLMAPIError(Exception):
+    """A request the API refused or that could not be completed"""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class TokenBucket:
+    """Allows ``per_minute`` units a minute, in bursts of up to a minute's worth.
+
+    Reservations are granted immediately and may overdraw the bucket; the
+    returned delay is how long the caller must wait before acting on it.
+    Callers therefore never hold a lock while they wait.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take ``amount`` units; returns the seconds until they are actually available"""
+        # A request larger than the whole bucket would otherwise never fit
+        amount = min(amount, self.capacity)
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+        self.level -= amount
+        return max(0.0, -self.level / self.rate)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limits shared by every request of an LLMInterface"""
+
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0):
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def reserve(self, tokens: int) -> float:
+        """Account for one request of ``tokens`` tokens; returns the seconds to wait before sending it"""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._resume_at - now
+            if self.requests is not None:
+                delay = max(delay, self.requests.reserve(1, now))
+            if self.tokens is not None:
+                delay = max(delay, self.tokens.reserve(tokens, now))
+            return max(0.0, delay)
+
+    def defer(self, seconds: float):
+        """Hold back every request for ``seconds``, e.g. after a 429 with Retry-After"""
+        with self._lock:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delay-seconds or HTTP-date), or None if absent or unreadable"""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float = LLM_BACKOFF_BASE, cap: float = LLM_BACKOFF_MAX) -> float:
+    """Full-jitter exponential backoff: a random delay up to ``base * 2**attempt``, capped"""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
@@ -0,0 +1,80 @@
+"""
+Rule engine module for Revenue Watchdog
+Vectorized rule-based leakage detection used when the LLM is unavailable
+"""
+
+import pandas as pd
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+
+from config import HIGH_DISCOUNT_THRESHOLD, OPPORTUNITY_COST_FACTOR
+from utils.helpers import parse_date_column
+from .deal_dataset import DealDataset, SOURCE_FIELD
+
+
+def _numeric_column(dataset: DealDataset, name: str) -> pd.Series:
+    """Return a column as floats, treating missing or invalid values as 0.
+
+    float32 schema columns stay float32 so values such as 22.3 keep their
+    short form in suggestion text; everything else is widened to float64.
+    """
+    values = pd.to_numeric(dataset.column(name, 0), errors='coerce').fillna(0)
+    return values if values.dtype == 'float32' else values.astype('float64')
+
+
+def evaluate_rules(dataset: DealDataset, as_of: Optional[datetime] = None) -> Tuple[List[Dict[str, Any]], float]:
+    """Evaluate the built-in leakage rules over whole columns.
+
+    Returns the flagged deals, in the same per-deal order the rules are
+    listed, together with the total estimated leakage. Deals from a session
+    dataset also carry the file they came from.
+    """
+    if not len(dataset):
+        return [], 0
+
+    as_of = as_of or datetime.now()
+    deal_ids = dataset.column('deal_id', 'Unknown')
+    deal_size = _numeric_column(dataset, 'deal_size')
+    discount = _numeric_column(dataset, 'discount_percent')
+    positions = pd.RangeIndex(len(dataset))
+
+    # Flag high discounts
+    discount_mask = (discount > HIGH_DISCOUNT_THRESHOLD).to_numpy()
+    discount_hits = pd.DataFrame({
+        'position': positions[discount_mask],
+        'rule': 0,
+        'deal_id': deal_ids[discount_mask].to_numpy(),
+        'risk_type': 'unauthorized_discount',
+        'impact': (deal_size * (discount - HIGH_DISCOUNT_THRESHOLD) / 100)[discount_mask].to_numpy(),
+    })
+    discount_hits['suggestion'] = [
+        f'Review {str(pct)}% discount approval for deal {deal_id}'
+        for pct, deal_id in zip(discount[discount_mask].to_numpy(), discount_hits['deal_id'].tolist())
+    ]
+
+    # Flag expired deals still in pipeline; the parser has already typed the
+    # column, so this is a single comparison against the as-of timestamp
+    close_dates = parse_date_column(dataset.column('close_date', pd.NaT))
+    expired_mask = (close_dates < pd.Timestamp(as_of)).to_numpy()
+    expired_hits = pd.DataFrame({
+        'position': positions[expired_mask],
+        'rule': 1,
+        'deal_id': deal_ids[expired_mask].to_numpy(),
+        'risk_type': 'phantom_pipeline',
+        'impact': (deal_size * OPPORTUNITY_COST_FACTOR)[expired_mask].to_numpy(),
+    })
+    expired_hits['suggestion'] = [
+        f'Remove expired deal {deal_id} from pipeline' for deal_id in expired_hits['deal_id'].tolist()
+    ]
+
+    columns = ['deal_id', 'risk_type', 'impact', 'suggestion']
+    hits = pd.concat([discount_hits, expired_hits], ignore_index=True)
+    if SOURCE_FIELD in dataset.columns:
+        sources = dataset.column(SOURCE_FIELD).astype(object).to_numpy()
+        hits[SOURCE_FIELD] = sources[hits['position'].to_numpy(dtype=int)]
+        columns.append(SOURCE_FIELD)
+    hits = hits.sort_values(['position', 'rule'], kind='stable')[columns]
+
+    flagged_deals = hits.to_dict('records')
+    total_leakage = sum(hits['impact'].tolist(), 0)
+    return flagged_deals, total_leakage
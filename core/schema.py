@@ -0,0 +1,127 @@
+"""
+Schema resolution module for Revenue Watchdog
+Maps raw file headers onto standard deal fields, caching one plan per header layout
+"""
+
+import difflib
+import re
+from collections import OrderedDict
+from typing import Dict, List, NamedTuple, Sequence
+
+from config import COLUMN_MAPPING, STANDARD_FIELDS, DEAL_DTYPES, SCHEMA_CACHE_SIZE
+from .cache import hash_key
+
+# Every field name the watchdog understands, standard or mapped
+KNOWN_FIELDS = list(dict.fromkeys(list(STANDARD_FIELDS) + list(COLUMN_MAPPING.values())))
+FUZZY_CUTOFF = 0.85
+
+# Words that qualify a header without changing which field it is
+QUALIFIER_TOKENS = {'total', 'net', 'gross', 'usd', 'eur', 'gbp', 'amt', 'name', 'pct', 'percent', 'percentage'}
+
+
+class ColumnPlan(NamedTuple):
+    """How to read and rename the columns of one header layout"""
+    columns: List[str]          # Final column name for each raw header, by position
+    rename: Dict[str, str]      # Raw header -> final name, for headers that change
+    projection: List[str]       # Raw headers that map onto a known field
+    dtypes: Dict[str, str]      # Raw header -> dtype to apply while reading
+
+
+def normalize_header(name: str) -> str:
+    """Lowercase a header and replace spaces with underscores"""
+    return str(name).lower().replace(' ', '_')
+
+
+def canonical_header(name: str) -> str:
+    """Reduce a header to bare words, e.g. "Deal Value (USD)" -> "deal_value" """
+    name = re.sub(r'\(.*?\)|\[.*?\]', ' ', str(name).lower())
+    return re.sub(r'[^a-z0-9]+', '_', name).strip('_')
+
+
+class SchemaResolver:
+    """Resolves header rows to column plans, caching by header fingerprint.
+
+    CRM exports arrive in a few recurring layouts, so each distinct header
+    is resolved once and every later file with that layout reuses the plan.
+    """
+
+    def __init__(self, max_entries: int = SCHEMA_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._plans = OrderedDict()
+
+    def fingerprint(self, header: Sequence[str]) -> str:
+        """Identify a header layout by its exact column names and order"""
+        return hash_key(tuple(str(col) for col in header))
+
+    def resolve(self, header: Sequence[str]) -> ColumnPlan:
+        """Return the column plan for a header, resolving it on first sight"""
+        key = self.fingerprint(header)
+        plan = self._plans.get(key)
+        if plan is not None:
+            self._plans.move_to_end(key)
+            return plan
+
+        plan = self._build_plan([str(col) for col in header])
+        self._plans[key] = plan
+        if len(self._plans) > self.max_entries:
+            self._plans.popitem(last=False)
+        return plan
+
+    def _build_plan(self, header: List[str]) -> ColumnPlan:
+        columns = [normalize_header(col) for col in header]
+
+        # Exact aliases first, in COLUMN_MAPPING order
+        for old_col, new_col in COLUMN_MAPPING.items():
+            if old_col in columns and new_col not in columns:
+                columns = [new_col if col == old_col else col for col in columns]
+
+        # Then fuzzy matches for whatever is still unrecognized
+        for i, col in enumerate(columns):
+            if col in KNOWN_FIELDS:
+                continue
+            field = self._fuzzy_field(header[i])
+            if field and field not in columns:
+                columns[i] = field
+
+        rename = {raw: col for raw, col in zip(header, columns) if raw != col}
+        projection = [raw for raw, col in zip(header, columns) if col in KNOWN_FIELDS]
+        dtypes = {
+            raw: DEAL_DTYPES[col]
+            for raw, col in zip(header, columns)
+            if DEAL_DTYPES.get(col) == 'category'
+        }
+        return ColumnPlan(columns, rename, projection, dtypes)
+
+    def _fuzzy_field(self, raw: str) -> str:
+        """Match a header like "Deal Value (USD)" or "Customer Nme" to a known field"""
+        name = canonical_header(raw)
+        if not name:
+            return ''
+
+        for candidate in self._stripped_names(name):
+            if candidate in KNOWN_FIELDS:
+                return candidate
+            if candidate in COLUMN_MAPPING:
+                return COLUMN_MAPPING[candidate]
+
+        candidates = KNOWN_FIELDS + list(COLUMN_MAPPING)
+        matches = difflib.get_close_matches(name, candidates, n=1, cutoff=FUZZY_CUTOFF)
+        if not matches:
+            return ''
+        return COLUMN_MAPPING.get(matches[0], matches[0])
+
+    def _stripped_names(self, name: str) -> List[str]:
+        """List a header with qualifier words peeled off, e.g. "client_name" -> "client" """
+        tokens = name.split('_')
+        names = [name]
+        while len(tokens) > 1 and tokens[0] in QUALIFIER_TOKENS:
+            tokens = tokens[1:]
+            names.append('_'.join(tokens))
+        while len(tokens) > 1 and tokens[-1] in QUALIFIER_TOKENS:
+            tokens = tokens[:-1]
+            names.append('_'.join(tokens))
+        return names
+
+
+# Shared by every parser in the process so plans carry across files
+default_resolver = SchemaResolver()
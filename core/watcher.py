@@ -0,0 +1,143 @@
+"""
+Folder watching module for Revenue Watchdog
+Polls a drop folder and parses only the files that are new or have changed
+"""
+
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from config import INGEST_MAX_WORKERS, WATCH_INDEX_DIR, WATCH_SETTLE_SECONDS
+from .cache import hash_file, hash_key
+from .data_parser import DataParser
+from .ingest import ParseResult, parse_files_parallel
+
+INDEX_VERSION = 1
+
+
+class FolderWatcher:
+    """Tracks the files in one folder through a persistent index.
+
+    Each indexed file records its mtime, size and content hash. A scan
+    compares cheap stat results first and only hashes files whose stat
+    changed, so an idle folder costs one directory listing per poll. Files
+    whose content is unchanged (e.g. re-copied or touched) are not parsed
+    again. Polling needs no inotify, so it works on any filesystem.
+    """
+
+    def __init__(self, folder: str, index_path: Optional[str] = None,
+                 max_workers: Optional[int] = INGEST_MAX_WORKERS,
+                 parser_options: Optional[Dict[str, Any]] = None,
+                 settle_seconds: float = WATCH_SETTLE_SECONDS):
+        self.folder = Path(folder).resolve()
+        self.index_path = Path(index_path) if index_path else \
+            Path(WATCH_INDEX_DIR) / f"{hash_key(str(self.folder))}.json"
+        self.max_workers = max_workers
+        self.parser_options = parser_options or {}
+        self.settle_seconds = settle_seconds
+        self._parser = DataParser(use_cache=False)
+        self._files = self._load_index()
+        self._pending = {}
+
+    def _load_index(self) -> Dict[str, Dict[str, Any]]:
+        """Read the saved index, starting empty if it is missing or unreadable"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if index.get('version') != INDEX_VERSION or index.get('folder') != str(self.folder):
+            return {}
+        return index.get('files', {})
+
+    def save_index(self):
+        """Write the index atomically so a crash never leaves it half-written"""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        index = {'version': INDEX_VERSION, 'folder': str(self.folder), 'files': self._files}
+        fd, tmp_path = tempfile.mkstemp(dir=self.index_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(index, f, indent=1)
+            os.replace(tmp_path, self.index_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def scan(self, include_unchanged: bool = False) -> List[str]:
+        """Return files that are new or changed since they were last parsed.
+
+        ``include_unchanged`` also returns indexed files whose content is
+        the same, for reloading a folder into a fresh session; the parse
+        cache serves those without re-parsing. Paths are ordered oldest
+        first so later exports win when deals repeat.
+        """
+        now = time.time()
+        found = {}
+        changed = []
+        with os.scandir(self.folder) as entries:
+            for entry in entries:
+                if entry.name.startswith(('.', '~$')) or not entry.is_file():
+                    continue
+                if not self._parser.can_parse(entry.path):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                found[entry.name] = stat
+                if now - stat.st_mtime < self.settle_seconds:
+                    # Still being written; pick it up on a later poll
+                    continue
+
+                known = self._files.get(entry.name)
+                if known and known['mtime_ns'] == stat.st_mtime_ns and known['size'] == stat.st_size:
+                    if include_unchanged:
+                        changed.append(entry.path)
+                    continue
+
+                try:
+                    content_hash = hash_file(entry.path)
+                except OSError:
+                    continue
+                record = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'hash': content_hash}
+                if known and known['hash'] == content_hash:
+                    self._files[entry.name] = dict(known, **record)
+                    if include_unchanged:
+                        changed.append(entry.path)
+                    continue
+                self._pending[entry.path] = (entry.name, record)
+                changed.append(entry.path)
+
+        # Forget files that have left the folder
+        for name in set(self._files) - set(found):
+            del self._files[name]
+
+        changed.sort(key=lambda path: (found[Path(path).name].st_mtime_ns, path))
+        return changed
+
+    def parse(self, file_paths: List[str]) -> Iterator[ParseResult]:
+        """Parse scanned files in parallel, recording each outcome in the index.
+
+        Failed files are indexed too, so a broken export is reported once
+        rather than on every poll; it is retried when its content changes.
+        """
+        try:
+            for file_path, dataset, error in parse_files_parallel(file_paths, self.max_workers, self.parser_options):
+                pending = self._pending.pop(file_path, None)
+                if pending is not None:
+                    name, record = pending
+                    record['error'] = str(error) if error is not None else None
+                    self._files[name] = record
+                yield file_path, dataset, error
+        finally:
+            self.save_index()
+
+    def poll(self, include_unchanged: bool = False) -> Iterator[ParseResult]:
+        """Scan the folder and parse whatever changed"""
+        file_paths = self.scan(include_unchanged)
+        if file_paths:
+            yield from self.parse(file_paths)
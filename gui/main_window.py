@@ -4,14 +4,31 @@ Main GUI window for Revenue Watchdog application - Polished Version
 
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-import pandas as pd
+import importlib
+import queue
+import threading
 from datetime import datetime
 from pathlib import Path
 
-from core.data_parser import DataParser
-from core.llm_interface import LLMInterface
-from config import WINDOW_SIZE, APP_TITLE, DATETIME_FORMAT, EXPORT_COMMENT_PREFIX
+from config import (WINDOW_SIZE, APP_TITLE, DATETIME_FORMAT, UI_POLL_INTERVAL_MS,
+                    WATCH_POLL_INTERVAL_MS)
 from utils.helpers import center_window, format_currency
+from utils.profiling import Profiler
+
+# Modules that pull in pandas, requests and the PDF/Excel backends. They are
+# imported on a background thread once the window is up; code that needs one
+# sooner imports it directly and waits on the same import lock.
+BACKGROUND_MODULES = ['core.deal_dataset', 'core.data_parser', 'core.ingest', 'core.llm_interface', 'core.watcher']
+
+
+def _preload_modules():
+    """Background thread: import the heavy modules ahead of first use"""
+    for name in BACKGROUND_MODULES:
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            # Reported by check_dependencies or when the feature is used
+            pass
 
 
 class RevenueWatchdogApp:
@@ -28,22 +45,63 @@ class RevenueWatchdogApp:
         width, height = map(int, WINDOW_SIZE.split('x'))
         center_window(root, width, height)
         
-        # Initialize components
-        self.data_parser = DataParser()
-        self.llm_interface = LLMInterface()
+        # Components are created on first use (see the properties below)
+        self._data_parser = None
+        self._llm_interface = None
         
         # Data storage
-        self.parsed_data = []
+        self._parsed_data = None
         self.analysis_results = {}
         
+        # Timing and memory of the latest parse, analysis, render and export
+        self.profiler = Profiler()
+        
         # UI state variables
         self.api_configured = False
         self.analysis_in_progress = False
+        self.upload_in_progress = False
+        
+        # Watched folder mode
+        self.folder_watcher = None
+        self._watch_job = None
+        # First session chunk whose deals the current analysis has not seen yet
+        self._refresh_from_chunk = None
         
         # Create UI
         self.create_ui()
         self.update_ui_state()
         
+        threading.Thread(target=_preload_modules, daemon=True).start()
+    
+    @property
+    def data_parser(self):
+        """Deal file parser, created on first use"""
+        if self._data_parser is None:
+            from core.data_parser import DataParser
+            self._data_parser = DataParser()
+        return self._data_parser
+    
+    @property
+    def llm_interface(self):
+        """LLM client, created on first use"""
+        if self._llm_interface is None:
+            from core.llm_interface import LLMInterface
+            self._llm_interface = LLMInterface()
+        return self._llm_interface
+    
+    @property
+    def parsed_data(self):
+        """Session dataset, created on first use"""
+        if self._parsed_data is None:
+            from core.deal_dataset import IncrementalDealDataset
+            self._parsed_data = IncrementalDealDataset()
+        return self._parsed_data
+    
+    @property
+    def has_data(self):
+        """Whether any deals are loaded, without loading the dataset module"""
+        return self._parsed_data is not None and bool(self._parsed_data)
+        
     def setup_styles(self):
         """Configure custom styles for better appearance"""
         style = ttk.Style()
@@ -141,6 +199,16 @@ class RevenueWatchdogApp:
                                        command=self.upload_files)
         self.upload_button.pack(side=tk.LEFT, padx=(0, 10))
         
+        # Watch folder button with icon
+        self.watch_button = ttk.Button(button_container, text="👁️ Watch Folder", 
+                                      command=self.toggle_watch_folder)
+        self.watch_button.pack(side=tk.LEFT, padx=(0, 10))
+        
+        # Clear button with icon
+        self.clear_button = ttk.Button(button_container, text="🗑️ Clear Data", 
+                                      command=self.clear_data)
+        self.clear_button.pack(side=tk.LEFT, padx=(0, 10))
+        
         # Analyze button with icon
         self.analyze_button = ttk.Button(button_container, text="🤖 Analyze Data", 
                                         command=self.analyze_data, style="Accent.TButton")
@@ -290,8 +358,10 @@ class RevenueWatchdogApp:
     def update_ui_state(self):
         """Update UI state based on current application state"""
         # Update button states
-        self.analyze_button['state'] = 'normal' if (self.api_configured and self.parsed_data and not self.analysis_in_progress) else 'disabled'
+        self.analyze_button['state'] = 'normal' if (self.api_configured and self.has_data and not self.analysis_in_progress) else 'disabled'
         self.export_button['state'] = 'normal' if self.analysis_results else 'disabled'
+        self.clear_button['state'] = 'normal' if (self.has_data and not self.upload_in_progress
+                                                  and not self.analysis_in_progress) else 'disabled'
         
         # Update API status
         if self.api_configured:
@@ -326,10 +396,15 @@ class RevenueWatchdogApp:
     
     def upload_files(self):
         """Handle file upload with better progress indication"""
+        if self.upload_in_progress:
+            return
+        
         file_types = [
-            ("All Supported", "*.csv;*.txt;*.pdf"),
+            ("All Supported", "*.csv;*.txt;*.xlsx;*.gz;*.bz2;*.zst;*.zip;*.pdf"),
             ("CSV files", "*.csv"),
             ("Text files", "*.txt"),
+            ("Excel files", "*.xlsx"),
+            ("Compressed files", "*.gz;*.bz2;*.zst;*.zip"),
             ("PDF files", "*.pdf")
         ]
         
@@ -345,34 +420,122 @@ class RevenueWatchdogApp:
         if not file_paths:
             return
         
-        self.show_progress("Parsing files...")
-        self.root.update()
-        
-        all_data = []
-        successful_files = 0
-        failed_files = []
+        self._start_ingest(list(file_paths))
+    
+    def _start_ingest(self, file_paths, watcher=None):
+        """Parse files in the background, from the upload dialog or a watched folder"""
+        self.upload_in_progress = True
+        self.upload_button['state'] = 'disabled'
+        self.update_ui_state()
+        self.show_progress(f"Parsing {len(file_paths)} file(s)...")
+        
+        # Parse in a process pool on a background thread; results come back
+        # through a queue that the Tk main loop polls
+        self._upload_state = {
+            'file_paths': file_paths,
+            'datasets': {},
+            'successful_files': 0,
+            'failed_files': [],
+            'watcher': watcher
+        }
+        if watcher is not None:
+            parse = watcher.parse
+        else:
+            from core.ingest import parse_files_parallel
+            parse = parse_files_parallel
+        self._upload_queue = queue.Queue()
+        worker = threading.Thread(target=self._run_upload, args=(file_paths, self._upload_queue, parse), daemon=True)
+        worker.start()
+        self.root.after(UI_POLL_INTERVAL_MS, self._poll_upload_queue)
+    
+    def _run_upload(self, file_paths, result_queue, parse):
+        """Background thread: parse files and report each completion"""
+        try:
+            with self.profiler.stage('parse') as record:
+                record['rows'] = 0
+                for result in parse(file_paths):
+                    if result[1] is not None:
+                        record['rows'] += len(result[1])
+                    result_queue.put(result)
+        except Exception as e:
+            # Pool-level failure such as a crashed worker process
+            result_queue.put((None, None, e))
+        result_queue.put(None)
+    
+    def _poll_upload_queue(self):
+        """Drain completed files from the upload queue and refresh progress"""
+        state = self._upload_state
         
-        for file_path in file_paths:
+        while True:
             try:
-                file_data = self.data_parser.parse_file(file_path)
-                all_data.extend(file_data)
-                successful_files += 1
-            except Exception as e:
-                failed_files.append(f"{Path(file_path).name}: {str(e)}")
+                result = self._upload_queue.get_nowait()
+            except queue.Empty:
+                break
+            
+            if result is None:
+                self._finish_upload()
+                return
+            
+            file_path, dataset, error = result
+            if error is None:
+                state['datasets'][file_path] = dataset
+                state['successful_files'] += 1
+            elif file_path is None:
+                state['failed_files'].append(f"Parser pool: {str(error)}")
+            else:
+                state['failed_files'].append(f"{Path(file_path).name}: {str(error)}")
+            
+            done = state['successful_files'] + len(state['failed_files'])
+            self.progress_label.config(text=f"Parsing files... {done}/{len(state['file_paths'])} done")
         
+        self.root.after(UI_POLL_INTERVAL_MS, self._poll_upload_queue)
+    
+    def _finish_upload(self):
+        """Add parsed files to the session dataset and report the upload outcome"""
+        state = self._upload_state
+        successful_files = state['successful_files']
+        failed_files = state['failed_files']
+        
+        self.upload_in_progress = False
+        self.upload_button['state'] = 'normal'
+        self.update_ui_state()
         self.hide_progress()
         
+        added = replaced = removed = parse_errors = 0
+        state['first_chunk'] = self.parsed_data.chunk_count
         if successful_files > 0:
-            self.parsed_data = all_data
+            # Append in selection order so later files win when deals repeat
+            with self.profiler.stage('merge') as record:
+                for file_path in state['file_paths']:
+                    dataset = state['datasets'].get(file_path)
+                    if dataset is not None:
+                        file_added, file_replaced, file_removed = self.parsed_data.append(dataset, file_path)
+                        added += file_added
+                        replaced += file_replaced
+                        removed += file_removed
+                        parse_errors += dataset.error_count
+                record['rows'] = added + replaced
+            
             self.display_raw_data()
             self.file_info_label.config(
-                text=f"📁 {len(all_data)} deals loaded from {successful_files} file(s)"
+                text=f"📁 {len(self.parsed_data)} deals loaded from {len(self.parsed_data.sources)} file(s)"
             )
-            self.status_var.set(f"✅ Successfully loaded {len(all_data)} deals")
+            status = f"✅ Successfully loaded {added} new deals ({replaced} updated"
+            self.status_var.set(status + (f", {removed} removed)" if removed else ")"))
             self.update_ui_state()
-            
+        
+        if state['watcher'] is not None:
+            self._finish_watch_poll(state, added, replaced, removed)
+            return
+        
+        if successful_files > 0:
             # Show success message with details
-            success_msg = f"Successfully loaded {len(all_data)} deals from {successful_files} file(s)"
+            success_msg = f"Successfully loaded {added} new deals from {successful_files} file(s)"
+            if replaced:
+                success_msg += f"\n{replaced} deal(s) already loaded were updated instead of duplicated"
+            success_msg += f"\n\nSession total: {len(self.parsed_data)} deals"
+            if parse_errors:
+                success_msg += f"\n\n{parse_errors} value(s) could not be parsed and were left blank"
             if failed_files:
                 success_msg += f"\n\nFailed files:\n" + "\n".join(failed_files[:3])
                 if len(failed_files) > 3:
@@ -385,6 +548,156 @@ class RevenueWatchdogApp:
                 messagebox.showerror("Upload Failed", 
                                    "All files failed to load:\n" + "\n".join(failed_files[:5]))
     
+    def toggle_watch_folder(self):
+        """Start or stop polling a folder for new and changed deal files"""
+        if self.folder_watcher is not None:
+            if self._watch_job is not None:
+                self.root.after_cancel(self._watch_job)
+                self._watch_job = None
+            self.status_var.set(f"Stopped watching {self.folder_watcher.folder}")
+            self.folder_watcher = None
+            self.watch_button.config(text="👁️ Watch Folder")
+            return
+        
+        folder = filedialog.askdirectory(title="Select a folder to watch for deal files")
+        if not folder:
+            return
+        
+        from core.watcher import FolderWatcher
+        self.folder_watcher = FolderWatcher(folder)
+        self.watch_button.config(text="⏹️ Stop Watching")
+        self.status_var.set(f"👁️ Watching {self.folder_watcher.folder}")
+        # The first scan also reloads files seen in earlier sessions; the
+        # parse cache serves those without re-parsing
+        self._watch_scan_all = True
+        self._watch_tick()
+    
+    def _watch_tick(self):
+        """Scan the watched folder on a background thread"""
+        self._watch_job = None
+        watcher = self.folder_watcher
+        if watcher is None:
+            return
+        if self.upload_in_progress:
+            self._schedule_watch_tick()
+            return
+        
+        scan_all, self._watch_scan_all = self._watch_scan_all, False
+        self._watch_queue = queue.Queue()
+        
+        def run_scan():
+            try:
+                self._watch_queue.put(watcher.scan(include_unchanged=scan_all))
+            except Exception as e:
+                self._watch_queue.put(e)
+        
+        threading.Thread(target=run_scan, daemon=True).start()
+        self.root.after(UI_POLL_INTERVAL_MS, self._poll_watch_scan, watcher)
+    
+    def _poll_watch_scan(self, watcher):
+        """Hand changed files from a finished folder scan to the parser"""
+        try:
+            result = self._watch_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(UI_POLL_INTERVAL_MS, self._poll_watch_scan, watcher)
+            return
+        
+        if watcher is not self.folder_watcher:
+            # Watching was stopped or restarted while the scan ran
+            return
+        if isinstance(result, Exception):
+            self.status_var.set(f"❌ Cannot scan {watcher.folder}: {str(result)}")
+            self._schedule_watch_tick()
+        elif result and not self.upload_in_progress:
+            self._start_ingest(result, watcher)
+        else:
+            self._schedule_watch_tick()
+    
+    def _schedule_watch_tick(self):
+        if self.folder_watcher is not None and self._watch_job is None:
+            self._watch_job = self.root.after(WATCH_POLL_INTERVAL_MS, self._watch_tick)
+    
+    def _finish_watch_poll(self, state, added, replaced, removed):
+        """Report a watched-folder batch in the status bar and refresh the analysis"""
+        failed_files = state['failed_files']
+        watcher = state['watcher']
+        
+        status = f"👁️ {Path(watcher.folder).name}: {added} new deals ({replaced} updated"
+        status += f", {removed} removed) " if removed else ") "
+        status += f"from {state['successful_files']} file(s)"
+        if failed_files:
+            status += f", {len(failed_files)} file(s) failed - {failed_files[0]}"
+        self.status_var.set(status)
+        
+        # Bring an existing analysis up to date with the deals this batch added, replaced or removed
+        if state['successful_files'] and (self.analysis_results or self.analysis_in_progress):
+            if self._refresh_from_chunk is None:
+                self._refresh_from_chunk = state['first_chunk']
+            self._start_analysis_refresh()
+        
+        if watcher is self.folder_watcher:
+            self._schedule_watch_tick()
+    
+    def _start_analysis_refresh(self):
+        """Analyze deals changed since the last analysis on a background thread"""
+        if (self._refresh_from_chunk is None or self.analysis_in_progress or not self.analysis_results
+                or not self.api_configured):
+            return
+        
+        changed = self.parsed_data.since(self._refresh_from_chunk)
+        changed_keys = self.parsed_data.keys_since(self._refresh_from_chunk)
+        self._refresh_from_chunk = None
+        if not changed_keys:
+            return
+        
+        previous = self.analysis_results
+        self.analysis_in_progress = True
+        self.update_ui_state()
+        self.status_var.set(f"🔄 Refreshing analysis for {len(changed_keys)} changed deal(s)...")
+        
+        result_queue = queue.Queue()
+        
+        def run_refresh():
+            try:
+                result_queue.put(self.llm_interface.update_analysis(
+                    previous, changed, self.profiler, changed_keys=changed_keys, key_for=self.parsed_data.deal_key))
+            except Exception as e:
+                result_queue.put(e)
+        
+        threading.Thread(target=run_refresh, daemon=True).start()
+        self.root.after(UI_POLL_INTERVAL_MS, self._poll_analysis_refresh, result_queue)
+    
+    def _poll_analysis_refresh(self, result_queue):
+        """Show a finished background refresh, then start the next one if more files arrived meanwhile"""
+        try:
+            result = result_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(UI_POLL_INTERVAL_MS, self._poll_analysis_refresh, result_queue)
+            return
+        
+        self.analysis_in_progress = False
+        if isinstance(result, Exception):
+            self.status_var.set(f"❌ Analysis refresh failed: {str(result)}")
+        else:
+            self.analysis_results = result
+            self._show_analysis_results("Analysis refreshed")
+        self.update_ui_state()
+        self._start_analysis_refresh()
+    
+    def clear_data(self):
+        """Remove all loaded deals so the next upload starts a fresh session"""
+        if self.upload_in_progress or self.analysis_in_progress:
+            return
+        
+        self.parsed_data.clear()
+        self._refresh_from_chunk = None
+        self.profiler.reset()
+        self.data_text.delete(1.0, tk.END)
+        self.data_stats_label.config(text="No data loaded")
+        self.file_info_label.config(text="")
+        self.status_var.set("Data cleared - upload files to begin")
+        self.update_ui_state()
+    
     def analyze_data(self):
         """Perform AI analysis with better progress indication"""
         if not self.parsed_data:
@@ -396,27 +709,63 @@ class RevenueWatchdogApp:
             return
         
         self.analysis_in_progress = True
+        # A full analysis covers every loaded deal, so no watched-folder refresh is owed
+        self._refresh_from_chunk = None
+        first_chunk = self.parsed_data.chunk_count
+        deals = self.parsed_data.snapshot()
         self.update_ui_state()
         self.show_progress("Analyzing data with AI... This may take a few minutes")
         
+        # Analyze on a worker thread so the window keeps responding while batches are sent
+        result_queue = queue.Queue()
+        
+        def run_analysis():
+            try:
+                result_queue.put(self.llm_interface.analyze_deals(deals, self.profiler))
+            except Exception as e:
+                result_queue.put(e)
+        
+        threading.Thread(target=run_analysis, daemon=True).start()
+        self.root.after(UI_POLL_INTERVAL_MS, self._poll_analysis, result_queue, first_chunk)
+    
+    def _poll_analysis(self, result_queue, first_chunk):
+        """Show a finished background analysis, then catch up with files loaded while it ran"""
         try:
-            # Perform analysis
-            self.analysis_results = self.llm_interface.analyze_deals(self.parsed_data)
-            
-            # Display results
-            self.display_analysis_results()
-            self.status_var.set("✅ Analysis completed successfully")
-            
-            # Switch to summary tab
-            self.notebook.select(0)
-            
-        except Exception as e:
-            messagebox.showerror("Analysis Error", f"Analysis failed:\n{str(e)}")
+            result = result_queue.get_nowait()
+        except queue.Empty:
+            self.root.after(UI_POLL_INTERVAL_MS, self._poll_analysis, result_queue, first_chunk)
+            return
+        
+        self.analysis_in_progress = False
+        self.hide_progress()
+        if isinstance(result, Exception):
+            messagebox.showerror("Analysis Error", f"Analysis failed:\n{str(result)}")
             self.status_var.set("❌ Analysis failed")
-        finally:
-            self.analysis_in_progress = False
-            self.hide_progress()
             self.update_ui_state()
+            return
+        
+        self.analysis_results = result
+        self._show_analysis_results("Analysis completed")
+        
+        # Switch to summary tab
+        self.notebook.select(0)
+        self.update_ui_state()
+        
+        if self.parsed_data.chunk_count > first_chunk:
+            # Files loaded while the analysis ran are not in it yet
+            self._refresh_from_chunk = first_chunk
+            self._start_analysis_refresh()
+    
+    def _show_analysis_results(self, done_message):
+        """Render the current results and report them in the status bar"""
+        with self.profiler.stage('render', rows=len(self.analysis_results.get('flagged_deals', []))):
+            self.display_analysis_results()
+        errors = self.analysis_results.get('errors', [])
+        if errors:
+            self.status_var.set(f"⚠️ {done_message}; {len(errors)} batch(es) fell back to rule-based "
+                                f"analysis ({errors[0]['error']})  ⏱ {self.profiler.summary()}")
+        else:
+            self.status_var.set(f"✅ {done_message} successfully  ⏱ {self.profiler.summary()}")
     
     def display_raw_data(self):
         """Display raw parsed data with better formatting"""
@@ -429,13 +778,14 @@ class RevenueWatchdogApp:
             # Create formatted view
             summary = f"DATASET OVERVIEW\n{'='*50}\n"
             summary += f"Total Deals: {len(self.parsed_data)}\n"
-            summary += f"Loaded: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+            summary += f"Loaded: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+            for field, count in self.parsed_data.parse_errors.items():
+                summary += f"Unparseable {field} values: {count}\n"
+            summary += "\n"
             
             # Show field analysis
             if self.parsed_data:
-                all_fields = set()
-                for deal in self.parsed_data:
-                    all_fields.update(deal.keys())
+                all_fields = self.parsed_data.columns
                 
                 summary += f"FIELDS DETECTED ({len(all_fields)}):\n{'-'*30}\n"
                 for field in sorted(all_fields):
@@ -444,7 +794,7 @@ class RevenueWatchdogApp:
                 summary += f"\nSAMPLE RECORDS:\n{'-'*30}\n"
                 
                 # Show first few records with better formatting
-                for i, deal in enumerate(self.parsed_data[:3]):
+                for i, deal in enumerate(self.parsed_data.head(3)):
                     summary += f"\n[Record {i+1}]\n"
                     for key, value in deal.items():
                         summary += f"  {key}: {value}\n"
@@ -493,6 +843,14 @@ Generated: {datetime.now().strftime(DATETIME_FORMAT)}
             icon = self._get_risk_icon(risk_type)
             summary_text += f"{icon} {risk_type.replace('_', ' ').title()}: {data['count']} deals, {format_currency(data['impact'])} impact\n"
         
+        errors = self.analysis_results.get('errors', [])
+        if errors:
+            summary_text += f"\n⚠️  AI ANALYSIS INCOMPLETE\n{'-'*40}\n"
+            summary_text += (f"{sum(error['deals'] for error in errors)} deal(s) were checked by the built-in rules "
+                             f"because the AI request failed:\n")
+            for error in errors:
+                summary_text += f"• Batch {error['batch']} ({error['deals']} deals): {error['error']}\n"
+        
         summary_text += f"\n💡 KEY RECOMMENDATIONS\n{'-'*40}\n"
         for i, rec in enumerate(recommendations, 1):
             summary_text += f"{i}. {rec}\n"
@@ -647,68 +1005,14 @@ Generated: {datetime.now().strftime(DATETIME_FORMAT)}
         try:
             self.show_progress("Exporting results...")
             
-            flagged_deals = self.analysis_results.get('flagged_deals', [])
-            summary = self.analysis_results.get('summary', {})
-            
-            if file_path.endswith('.csv'):
-                self._export_csv(file_path, flagged_deals, summary)
-            elif file_path.endswith('.xlsx'):
-                self._export_excel(file_path, flagged_deals, summary)
-            elif file_path.endswith('.json'):
-                self._export_json(file_path, self.analysis_results)
+            from core.exporters import export_results
+            with self.profiler.stage('export', rows=len(self.analysis_results.get('flagged_deals', []))):
+                export_results(file_path, self.analysis_results, len(self.parsed_data), self.profiler.to_dict())
             
             self.hide_progress()
-            self.status_var.set(f"✅ Results exported to {Path(file_path).name}")
+            self.status_var.set(f"✅ Results exported to {Path(file_path).name}  ⏱ {self.profiler.summary()}")
             messagebox.showinfo("Export Complete", f"Results exported successfully to:\n{file_path}")
             
         except Exception as e:
             self.hide_progress()
             messagebox.showerror("Export Error", f"Export failed:\n{str(e)}")
-    
-    def _export_csv(self, file_path, flagged_deals, summary):
-        """Export to CSV format"""
-        df = pd.DataFrame(flagged_deals)
-        
-        with open(file_path, 'w', newline='', encoding='utf-8') as f:
-            f.write(f"{EXPORT_COMMENT_PREFIX} Revenue Leakage Analysis Report\n")
-            f.write(f"{EXPORT_COMMENT_PREFIX} Generated: {datetime.now().strftime(DATETIME_FORMAT)}\n")
-            f.write(f"{EXPORT_COMMENT_PREFIX} Total Leakage: {format_currency(summary.get('total_leakage', 0))}\n")
-            f.write(f"{EXPORT_COMMENT_PREFIX} High Risk Deals: {summary.get('high_risk_deals', 0)}\n")
-            f.write(f"{EXPORT_COMMENT_PREFIX}\n")
-            
-            df.to_csv(f, index=False)
-    
-    def _export_excel(self, file_path, flagged_deals, summary):
-        """Export to Excel format with multiple sheets"""
-        with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-            # Flagged deals sheet
-            df_deals = pd.DataFrame(flagged_deals)
-            df_deals.to_excel(writer, sheet_name='Flagged Deals', index=False)
-            
-            # Summary sheet
-            summary_data = {
-                'Metric': ['Total Leakage', 'High Risk Deals', 'Issues Found', 'Total Deals Analyzed'],
-                'Value': [summary.get('total_leakage', 0), 
-                         summary.get('high_risk_deals', 0),
-                         summary.get('issues_found', 0),
-                         len(self.parsed_data)]
-            }
-            df_summary = pd.DataFrame(summary_data)
-            df_summary.to_excel(writer, sheet_name='Summary', index=False)
-    
-    def _export_json(self, file_path, analysis_results):
-        """Export to JSON format"""
-        import json
-        
-        # Add metadata
-        export_data = {
-            'metadata': {
-                'generated': datetime.now().strftime(DATETIME_FORMAT),
-                'total_deals_analyzed': len(self.parsed_data),
-                'export_version': '1.0'
-            },
-            'analysis_results': analysis_results
-        }
-        
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, default=str)
\ No newline at end of file
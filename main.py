@@ -4,29 +4,39 @@ Revenue Leakage & Margin Watchdog
 A desktop finance tool for analyzing deal data and identifying revenue risks.
 
 Features:
-- File ingestion (CSV, PDF, TXT)
+- File ingestion (CSV, PDF, TXT, XLSX; gzip, bz2, zstd and zip archives)
+- Watched-folder ingestion of new and changed exports
 - Automated data analysis with AI-powered insights
 - Risk and margin surfacing
 - Export capabilities
 - Action suggestions
+- Headless batch mode for servers and cron (see cli.py)
 
 Author: AI Assistant
 Requirements: Python 3.7+, tkinter, pandas, requests
-Optional: PyPDF2 or pdfplumber for PDF processing
+Optional: PyPDF2 or pdfplumber for PDF processing, openpyxl for Excel files, zstandard for .zst files
 """
 
 import tkinter as tk
 import sys
 
-from gui.main_window import RevenueWatchdogApp
 from utils.helpers import check_dependencies
 from config import WINDOW_SIZE
 
 
+def create_app():
+    """Create the main window; pandas, requests and the file backends load in the background"""
+    from gui.main_window import RevenueWatchdogApp
+    
+    root = tk.Tk()
+    app = RevenueWatchdogApp(root)
+    return root, app
+
+
 def main():
     """Main application entry point"""
     
-    # Check required dependencies
+    # Check required dependencies (located on disk, not imported)
     missing_deps = check_dependencies()
     
     if missing_deps:
@@ -35,15 +45,14 @@ def main():
         return
     
     # Initialize and run application
-    root = tk.Tk()
-    app = RevenueWatchdogApp(root)
+    root, app = create_app()
     
     print("Starting Revenue Leakage & Margin Watchdog...")
     print("=" * 50)
     print("SETUP INSTRUCTIONS:")
     print("1. Get an API key from OpenRouter.ai")
     print("2. Enter your API key in the application")
-    print("3. Upload CSV/TXT/PDF files with deal data")
+    print("3. Upload CSV/TXT/XLSX/PDF files with deal data")
     print("4. Click 'Analyze Data' for AI-powered insights")
     print("5. Export results for further action")
     print("=" * 50)
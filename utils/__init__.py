@@ -5,18 +5,26 @@ Utility functions for Revenue Watchdog
 
 from .helpers import (
     is_date_past,
+    infer_date_format,
+    parse_date_column,
+    blank_mask,
     check_dependencies, 
     format_currency,
     center_window,
     normalize_column_name,
     validate_deal_data
 )
+from .profiling import Profiler
 
 __all__ = [
     'is_date_past',
+    'infer_date_format',
+    'parse_date_column',
+    'blank_mask',
     'check_dependencies',
     'format_currency', 
     'center_window',
     'normalize_column_name',
-    'validate_deal_data'
+    'validate_deal_data',
+    'Profiler'
 ]
\ No newline at end of file
@@ -2,35 +2,95 @@
 Utility functions for Revenue Watchdog application
 """
 
-import pandas as pd
+import importlib.util
 from datetime import datetime
-from typing import List
+from typing import TYPE_CHECKING, List, Optional
+
+# pandas is imported inside the functions that need it so the GUI can import
+# these helpers without paying for pandas before its window is shown
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 def is_date_past(date_str: str) -> bool:
     """Check if date string represents a past date"""
+    import pandas as pd
     try:
         date_obj = pd.to_datetime(date_str)
         return date_obj < datetime.now()
-    except:
+    except (ValueError, TypeError, OverflowError):
         return False
 
 
-def check_dependencies() -> List[str]:
-    """Check for missing required dependencies"""
-    missing_deps = []
-    
+def infer_date_format(values: 'pd.Series', sample_size: int = 20) -> Optional[str]:
+    """Guess a strptime format from the first non-blank values of a column"""
     try:
-        import pandas
+        from pandas.tseries.api import guess_datetime_format
     except ImportError:
-        missing_deps.append("pandas")
+        from pandas._libs.tslibs.parsing import guess_datetime_format
+    
+    sample = values.dropna().astype(str).str.strip()
+    for value in sample[sample != ''].head(sample_size):
+        date_format = guess_datetime_format(value)
+        if date_format:
+            return date_format
+    return None
+
+
+def parse_date_column(values: 'pd.Series', date_format: Optional[str] = None) -> 'pd.Series':
+    """Parse a column of dates in one pass, leaving unparseable values as NaT.
+    
+    Values with a time zone or offset are converted to UTC and values
+    without one are taken as UTC, so all rows come back naive and
+    comparable with one "as-of" timestamp.
+    """
+    import pandas as pd
+    
+    if pd.api.types.is_datetime64_any_dtype(values):
+        parsed = values
+    elif date_format:
+        parsed = _to_utc(values, date_format)
+        # Fall back to per-value inference for rows written in another format
+        missed = parsed.isna() & ~blank_mask(values)
+        if missed.any():
+            parsed[missed] = _to_utc(values[missed], 'mixed')
+    else:
+        parsed = _to_utc(values, 'mixed')
+    
+    if getattr(parsed.dt, 'tz', None) is not None:
+        parsed = parsed.dt.tz_convert(None)
+    return parsed
+
+
+def _to_utc(values: 'pd.Series', date_format: str) -> 'pd.Series':
+    """Parse values as UTC datetimes with ``date_format``, turning anything unreadable into NaT"""
+    import pandas as pd
     
     try:
-        import requests
-    except ImportError:
-        missing_deps.append("requests")
+        return pd.to_datetime(values, errors='coerce', format=date_format, utc=True)
+    except (TypeError, ValueError):
+        pass
+    try:
+        # pandas < 2.0 has no 'mixed' format and already parses element-wise
+        return pd.to_datetime(values, errors='coerce', utc=True)
+    except (TypeError, ValueError):
+        # Last resort: one value at a time, so a single odd value cannot fail the column
+        return pd.to_datetime(values.map(lambda value: pd.to_datetime(value, errors='coerce', utc=True)),
+                              errors='coerce', utc=True)
+
+
+def blank_mask(values: 'pd.Series') -> 'pd.Series':
+    """Flag missing or whitespace-only values in a column"""
+    import pandas as pd
     
-    return missing_deps
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values.isna()
+    return values.isna() | values.astype(str).str.strip().eq('')
+
+
+def check_dependencies() -> List[str]:
+    """Check for missing required dependencies without importing them"""
+    return [name for name in ("pandas", "requests") if importlib.util.find_spec(name) is None]
 
 
 def format_currency(amount: float) -> str:
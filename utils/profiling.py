@@ -0,0 +1,147 @@
+"""
+Per-stage instrumentation for Revenue Watchdog
+Records wall time, CPU time, peak memory and row counts for each pipeline stage
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from config import PROFILE_MEMORY
+
+# Optional process memory imports: resource on Unix, psutil elsewhere
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# Stages tracing memory right now, across every profiler and thread; tracing
+# starts with the first and stops with the last so no stage ends another's
+_tracing_lock = threading.Lock()
+_tracing_stages = 0
+_started_tracing = False
+
+
+def _cpu_time() -> float:
+    """CPU seconds used by this process and its finished children (e.g. parser pool workers)"""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def _max_rss_mb() -> Optional[float]:
+    """Highest resident set size this process has reached so far in MB, or None if it cannot be read"""
+    if RESOURCE_AVAILABLE:
+        max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Kilobytes on Linux, bytes on macOS
+        return round(max_rss / (1024 ** 2 if sys.platform == 'darwin' else 1024), 1)
+    if PSUTIL_AVAILABLE:
+        memory = psutil.Process().memory_info()
+        # Windows reports its peak working set; elsewhere only the current size is known
+        return round(getattr(memory, 'peak_wset', memory.rss) / 1024 ** 2, 1)
+    return None
+
+
+def _start_tracing():
+    """Begin a traced stage, starting tracemalloc if no other stage is tracing"""
+    global _tracing_stages, _started_tracing
+    with _tracing_lock:
+        if _tracing_stages == 0:
+            _started_tracing = not tracemalloc.is_tracing()
+            if _started_tracing:
+                tracemalloc.start()
+            elif hasattr(tracemalloc, 'reset_peak'):
+                # Python 3.9+; older versions report the peak since tracing started
+                tracemalloc.reset_peak()
+        _tracing_stages += 1
+
+
+def _stop_tracing() -> float:
+    """End a traced stage and return its peak in MB, stopping tracemalloc after the last stage if it started it"""
+    global _tracing_stages
+    with _tracing_lock:
+        peak_mb = round(tracemalloc.get_traced_memory()[1] / 1024 ** 2, 1)
+        _tracing_stages -= 1
+        if _tracing_stages == 0 and _started_tracing:
+            tracemalloc.stop()
+        return peak_mb
+
+
+class Profiler:
+    """Collects the latest measurement of each named stage.
+
+    Stages are meant to run one after another, not nested. Every stage
+    records ``max_rss_mb``, the process's resident memory high-water mark
+    when it ended. Reading it costs one system call. The mark only rises,
+    so a stage whose value is higher than the previous stage's set a new
+    peak. With ``trace_memory``, ``peak_mb`` is also recorded: the
+    tracemalloc high-water mark of Python allocations during the stage.
+    This is more precise but slows allocation-heavy stages. Neither figure
+    covers work done inside pool workers, which only shows up in the CPU
+    time. Memory tracing is process-wide, so when stages overlap on
+    different threads each peak covers the other's allocations too. A
+    disabled profiler measures nothing.
+    """
+
+    def __init__(self, enabled: bool = True, trace_memory: bool = PROFILE_MEMORY):
+        self.enabled = enabled
+        self.trace_memory = trace_memory
+        self._stages = OrderedDict()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, rows: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Measure the enclosed block; set ``record['rows']`` inside it if the count is known later"""
+        record = {'stage': name, 'rows': rows}
+        if not self.enabled:
+            yield record
+            return
+
+        if self.trace_memory:
+            _start_tracing()
+        wall_start, cpu_start = time.perf_counter(), _cpu_time()
+        try:
+            yield record
+        finally:
+            record['wall_s'] = round(time.perf_counter() - wall_start, 4)
+            record['cpu_s'] = round(_cpu_time() - cpu_start, 4)
+            record['peak_mb'] = None
+            if self.trace_memory:
+                record['peak_mb'] = _stop_tracing()
+            record['max_rss_mb'] = _max_rss_mb()
+            with self._lock:
+                self._stages.pop(name, None)
+                self._stages[name] = record
+
+    def reset(self):
+        """Forget every recorded stage"""
+        with self._lock:
+            self._stages.clear()
+
+    def to_dict(self) -> List[Dict[str, Any]]:
+        """Recorded stages in the order they last ran"""
+        with self._lock:
+            return [dict(record) for record in self._stages.values()]
+
+    def summary(self) -> str:
+        """One-line breakdown, e.g. "parse 1.20s · prompt 0.05s · http 3.10s" """
+        parts = []
+        for record in self.to_dict():
+            part = f"{record['stage']} {record['wall_s']:.2f}s"
+            if record['peak_mb'] is not None:
+                part += f"/{record['peak_mb']:.0f}MB"
+            elif record.get('max_rss_mb') is not None:
+                part += f"/{record['max_rss_mb']:.0f}MB rss"
+            parts.append(part)
+        return " · ".join(parts)